@@ -0,0 +1,351 @@
+"""Benchmarks for the tealprint hot paths.
+
+Runs offline and writes all messages to /dev/null and/or a pipe. Results are printed as JSON so that runs can be
+compared, e.g. before and after a change:
+
+    python benchmarks/benchmark.py --output before.json
+    python benchmarks/benchmark.py --target pipe --filter threads
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from statistics import median
+from threading import Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tealprint import TealConfig, TealLevel, TealPrint, TealPrintBuffer  # noqa: E402
+
+levels = [TealLevel.error, TealLevel.warning, TealLevel.info, TealLevel.verbose, TealLevel.debug]
+indent_depths = [0, 1, 5, 10, 25, 50]
+thread_counts = [1, 2, 4, 8, 16, 32]
+
+
+class Benchmark:
+    """A benchmark that sends a number of messages through tealprint"""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[int], None],
+        params: Dict[str, Any],
+        setup: Optional[Callable[[], None]] = None,
+        teardown: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Args:
+            name (str): Unique name of the benchmark
+            run (Callable[[int], None]): Sends the number of messages it's called with
+            params (Dict[str, Any]): Parameters of the benchmark, included in the results
+            setup (Callable[[], None]): Called before each run, not included in the timing
+            teardown (Callable[[], None]): Called after each run, not included in the timing
+        """
+        self.name = name
+        self.run = run
+        self.params = params
+        self.setup = setup
+        self.teardown = teardown
+
+
+def _level_benchmarks() -> Iterator[Benchmark]:
+    functions = {
+        TealLevel.error: TealPrint.error,
+        TealLevel.warning: TealPrint.warning,
+        TealLevel.info: TealPrint.info,
+        TealLevel.verbose: TealPrint.verbose,
+        TealLevel.debug: TealPrint.debug,
+    }
+    for level in levels:
+        for enabled in [True, False]:
+
+            def run(count: int, function=functions[level]) -> None:
+                for i in range(count):
+                    function("Message number %d", args=(i,))
+
+            config_level = level if enabled else TealLevel(level.value - 1)
+            yield Benchmark(
+                f"level/{level.name}/{'enabled' if enabled else 'disabled'}",
+                run,
+                {"level": level.name, "enabled": enabled},
+                setup=lambda config_level=config_level: setattr(TealConfig, "level", config_level),
+            )
+
+
+def _indent_benchmarks() -> Iterator[Benchmark]:
+    for depth in indent_depths:
+
+        def setup(depth=depth) -> None:
+            for _ in range(depth):
+                TealPrint.push_indent(TealLevel.info)
+
+        def run(count: int) -> None:
+            for i in range(count):
+                TealPrint.info("Indented message")
+
+        yield Benchmark(f"indent/{depth}", run, {"depth": depth}, setup=setup, teardown=TealPrint.clear_indent)
+
+
+def _render_benchmarks() -> Iterator[Benchmark]:
+    for colors_enabled in [True, False]:
+        for unicode_enabled in [True, False]:
+
+            def setup(colors_enabled=colors_enabled, unicode_enabled=unicode_enabled) -> None:
+                TealConfig.colors_enabled = colors_enabled
+                TealConfig.unicode_enabled = unicode_enabled
+
+            def run(count: int) -> None:
+                for i in range(count):
+                    TealPrint.info("🔥 \x1b[1mColored\x1b[0m message 🔥", color="\x1b[38;5;2m")
+
+            yield Benchmark(
+                f"render/colors_{'on' if colors_enabled else 'off'}/unicode_{'on' if unicode_enabled else 'off'}",
+                run,
+                {"colors_enabled": colors_enabled, "unicode_enabled": unicode_enabled},
+                setup=setup,
+            )
+
+
+def _exception_benchmarks() -> Iterator[Benchmark]:
+    def run(count: int) -> None:
+        for i in range(count):
+            try:
+                raise ValueError(f"Failure {i}")
+            except ValueError:
+                TealPrint.error("Failed", print_exception=True)
+
+    # Every traceback is formatted, instead of a "same as #1" line after the first one
+    yield Benchmark(
+        "exception/print_exception",
+        run,
+        {"print_exception": True, "exception_dedupe": False},
+        setup=lambda: setattr(TealConfig, "exception_dedupe", False),
+    )
+    yield Benchmark("exception/print_exception_deduped", run, {"print_exception": True, "exception_dedupe": True})
+
+
+def _flush_benchmarks() -> Iterator[Benchmark]:
+    def run_buffered(count: int) -> None:
+        buffer = TealPrintBuffer()
+        for i in range(count):
+            buffer.info("Buffered message")
+        buffer.flush()
+
+    def run_per_call(count: int) -> None:
+        for i in range(count):
+            TealPrint.info("Flushed message")
+
+    def run_lines(count: int) -> None:
+        TealPrint.lines(f"Row {i}" for i in range(count))
+
+    yield Benchmark("flush/buffer_one_flush", run_buffered, {"flush": "once"})
+    yield Benchmark("flush/per_call", run_per_call, {"flush": "per_call"})
+    yield Benchmark("flush/lines", run_lines, {"flush": "lines"})
+    yield Benchmark(
+        "flush/batched",
+        run_per_call,
+        {"flush": "batched"},
+        setup=lambda: setattr(TealConfig, "flush_level", TealLevel.warning),
+        teardown=TealPrint.flush,
+    )
+
+
+def _thread_benchmarks() -> Iterator[Benchmark]:
+    for thread_count in thread_counts:
+
+        def run(count: int, thread_count=thread_count) -> None:
+            def work() -> None:
+                for i in range(count // thread_count):
+                    TealPrint.info("Message from a thread")
+
+            threads = [Thread(target=work) for _ in range(thread_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        yield Benchmark(f"threads/{thread_count}", run, {"threads": thread_count})
+
+
+def _stats_benchmarks() -> Iterator[Benchmark]:
+    def run(count: int) -> None:
+        for i in range(count):
+            TealPrint.info("Counted message")
+
+    yield Benchmark(
+        "stats/enabled", run, {"stats": True}, setup=TealPrint.enable_stats, teardown=TealPrint.disable_stats
+    )
+
+
+def _channel_benchmarks() -> Iterator[Benchmark]:
+    channel = TealPrint.channel("benchmark.sub.channel")
+    for enabled in [True, False]:
+
+        def run(count: int) -> None:
+            for i in range(count):
+                channel.debug("Message number %d", args=(i,))
+
+        # Set on a parent, so that the level is inherited
+        level = TealLevel.debug if enabled else TealLevel.info
+        yield Benchmark(
+            f"channel/{'enabled' if enabled else 'disabled'}",
+            run,
+            {"enabled": enabled},
+            setup=lambda level=level: setattr(TealPrint.channel("benchmark"), "level", level),
+        )
+
+
+def _sampling_benchmarks() -> Iterator[Benchmark]:
+    def run(count: int) -> None:
+        for i in range(count):
+            TealPrint.debug("Message number %d", args=(i,))
+
+    def setup() -> None:
+        TealConfig.level = TealLevel.debug
+        TealConfig.sample_every = 100
+
+    yield Benchmark("sampling/1_in_100", run, {"sample_every": 100}, setup=setup, teardown=lambda: TealConfig.reset())
+
+
+benchmark_groups: List[Callable[[], Iterator[Benchmark]]] = [
+    _level_benchmarks,
+    _indent_benchmarks,
+    _render_benchmarks,
+    _exception_benchmarks,
+    _flush_benchmarks,
+    _thread_benchmarks,
+    _stats_benchmarks,
+    _channel_benchmarks,
+    _sampling_benchmarks,
+]
+
+
+@contextmanager
+def _redirect_stdout(target: str) -> Iterator[None]:
+    """Send stdout to /dev/null or a pipe that is drained by a reader thread"""
+    reader: Optional[Thread] = None
+    if target == "devnull":
+        stream: TextIO = open(os.devnull, "w", encoding="utf-8")
+    else:
+        read_fd, write_fd = os.pipe()
+        stream = os.fdopen(write_fd, "w", encoding="utf-8")
+
+        def drain() -> None:
+            with os.fdopen(read_fd, "rb") as pipe:
+                while pipe.read(65536):
+                    pass
+
+        reader = Thread(target=drain, daemon=True)
+        reader.start()
+
+    original = sys.stdout
+    sys.stdout = stream
+    try:
+        yield
+    finally:
+        sys.stdout = original
+        stream.close()
+        if reader:
+            reader.join()
+
+
+def _run_import(repeat: int) -> Dict[str, Any]:
+    """Time `import tealprint` in a fresh interpreter, minus the startup time of the interpreter itself"""
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def start(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=cwd)
+        return time.perf_counter() - start
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        timings.append(start("import tealprint") - start("pass"))
+
+    seconds = median(timings)
+    return {
+        "name": "import/tealprint",
+        "target": "none",
+        "params": {},
+        "repeat": repeat,
+        "seconds": seconds,
+        "best_seconds": min(timings),
+    }
+
+
+def _run(benchmark: Benchmark, target: str, messages: int, repeat: int) -> Dict[str, Any]:
+    timings: List[float] = []
+    with _redirect_stdout(target):
+        for _ in range(repeat):
+            TealConfig.reset()
+            if benchmark.setup:
+                benchmark.setup()
+            start = time.perf_counter()
+            benchmark.run(messages)
+            timings.append(time.perf_counter() - start)
+            if benchmark.teardown:
+                benchmark.teardown()
+    TealConfig.reset()
+
+    seconds = median(timings)
+    return {
+        "name": benchmark.name,
+        "target": target,
+        "params": benchmark.params,
+        "messages": messages,
+        "repeat": repeat,
+        "seconds": seconds,
+        "best_seconds": min(timings),
+        "messages_per_second": messages / seconds,
+        "ns_per_message": seconds * 1e9 / messages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tealprint and print the results as JSON")
+    parser.add_argument("--messages", type=int, default=20000, help="Messages per run (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the median is used")
+    parser.add_argument("--target", choices=["devnull", "pipe", "both"], default="both", help="Where to write")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="Write the JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    targets = ["devnull", "pipe"] if args.target == "both" else [args.target]
+    results = []
+    if args.filter in "import/tealprint":
+        result = _run_import(args.repeat)
+        results.append(result)
+        print(f"{result['name']}: {result['seconds'] * 1000:.1f} ms", file=sys.stderr)
+
+    for group in benchmark_groups:
+        for benchmark in group():
+            if args.filter not in benchmark.name:
+                continue
+            for target in targets:
+                result = _run(benchmark, target, args.messages, args.repeat)
+                results.append(result)
+                print(f"{result['name']} [{target}]: {result['messages_per_second']:.0f} msg/s", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
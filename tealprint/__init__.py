@@ -1,5 +1,40 @@
-# Exported classes
+from typing import Any
+
+# Exported classes. TealConfig first, since the sinks and renderers can only be imported once it exists
 from .tealconfig import TealConfig  # lgtm[py/unused_import] # noqa: F401
+from .tealbackpressure import TealBackpressure  # lgtm[py/unused_import] # noqa: F401
+from .tealblockfile import TealBlockFileReader  # lgtm[py/unused_import] # noqa: F401
+from .tealblockfile import TealBlockFileSink  # lgtm[py/unused_import] # noqa: F401
+from .tealchannel import TealChannel  # lgtm[py/unused_import] # noqa: F401
 from .teallevel import TealLevel  # lgtm[py/unused_import] # noqa: F401
+from .tealmultiprocess import TealCollector  # lgtm[py/unused_import] # noqa: F401
+from .tealmultiprocess import TealQueueSink  # lgtm[py/unused_import] # noqa: F401
 from .tealprint import TealPrint  # lgtm[py/unused_import] # noqa: F401
 from .tealprintbuffer import TealPrintBuffer  # lgtm[py/unused_import] # noqa: F401
+from .tealrecord import TealRecord  # lgtm[py/unused_import] # noqa: F401
+from .tealrenderer import TealJsonRenderer  # lgtm[py/unused_import] # noqa: F401
+from .tealrenderer import TealRenderer  # lgtm[py/unused_import] # noqa: F401
+from .tealsection import TealSection  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealFileSink  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealNullSink  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealRotatingFileSink  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealSink  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealStreamSink  # lgtm[py/unused_import] # noqa: F401
+from .tealsink import TealTextSink  # lgtm[py/unused_import] # noqa: F401
+from .tealstats import TealStats  # lgtm[py/unused_import] # noqa: F401
+from .tealstatus import TealStatus  # lgtm[py/unused_import] # noqa: F401
+from .tealterminal import TealTerminal  # lgtm[py/unused_import] # noqa: F401
+
+
+def __getattr__(name: str) -> Any:
+    # logging is slow to import, so the logging bridge is only imported when it's used
+    if name in ("TealLoggingHandler", "TealLoggingSink"):
+        from . import teallogging
+
+        return getattr(teallogging, name)
+    # The same for asyncio
+    if name == "TealAsyncWriter":
+        from . import tealasync
+
+        return tealasync.TealAsyncWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
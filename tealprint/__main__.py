@@ -0,0 +1,87 @@
+"""Print the messages of a TealBlockFileSink file, filtered by level, time and text.
+Only the blocks that can match the level and time range are decompressed.
+
+    python -m tealprint job.tlb --level warning --since 2024-05-01T12:00 --contains timeout
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from .tealblockfile import TealBlockFileReader
+from .teallevel import TealLevel
+from .tealrenderer import TealJsonRenderer, TealRenderer
+from .tealterminal import TealTerminal
+
+# Records are rendered and written in chunks of this many
+chunk_size = 1000
+
+
+def parse_time(value: str) -> float:
+    """Seconds since the epoch, or an ISO 8601 date and time. Times without a timezone are local times"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a time: {value!r}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tealprint", description="Print the messages of a TealBlockFileSink file"
+    )
+    parser.add_argument("path", help="File written by TealBlockFileSink")
+    parser.add_argument(
+        "--level",
+        choices=[level.name for level in TealLevel if level != TealLevel.none],
+        default="debug",
+        help="Highest level to print (default: %(default)s)",
+    )
+    parser.add_argument("--since", type=parse_time, help="Only messages at or after this time")
+    parser.add_argument("--until", type=parse_time, help="Only messages at or before this time")
+    parser.add_argument("--contains", help="Only messages that contain this text")
+    parser.add_argument("--json", action="store_true", help="Print JSON Lines instead of rendering the messages")
+    parser.add_argument("--index", action="store_true", help="Print the block index instead of the messages")
+    args = parser.parse_args(argv)
+
+    reader = TealBlockFileReader(args.path)
+    try:
+        if args.index:
+            for block in reader.index():
+                first = datetime.fromtimestamp(block.first).isoformat()
+                last = datetime.fromtimestamp(block.last).isoformat()
+                levels = ",".join(level.name for level in TealLevel if block.levels & (1 << level.value))
+                sys.stdout.write(f"{block.offset}\t{block.size}\t{block.count}\t{first}\t{last}\t{levels}\n")
+            return 0
+
+        if args.json:
+            renderer = TealJsonRenderer()
+        else:
+            terminal = TealTerminal.probe(sys.stdout)
+            renderer = TealRenderer.get(terminal.colors, terminal.unicode)
+
+        chunk = []
+        for record in reader.records(TealLevel[args.level], args.since, args.until, args.contains):
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                sys.stdout.write(renderer.render_records(chunk))
+                chunk = []
+        if len(chunk) > 0:
+            sys.stdout.write(renderer.render_records(chunk))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # E.g. piped to head, which has stopped reading
+        sys.stderr.close()
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"python -m tealprint: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+import pytest
+
+from .tealconfig import TealConfig
+
+
+@pytest.fixture
+def no_colors():
+    """Disable colors during the test, and reset TealConfig after it. Use with pytestmark in a test module"""
+    TealConfig.colors_enabled = False
+    yield
+    TealConfig.reset()
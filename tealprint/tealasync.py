@@ -0,0 +1,165 @@
+import asyncio
+import os
+import stat
+from collections import deque
+from time import perf_counter_ns
+from typing import AsyncGenerator, Deque, Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from .tealconfig import TealConfig
+from .tealrecord import TealRecord
+from .tealsink import TealStreamSink
+from .tealstats import TealStats
+
+
+class _PipeProtocol(asyncio.Protocol):
+    """Tells writers to wait while the transport's buffer is full"""
+
+    def __init__(self) -> None:
+        self.paused = False
+        self.closed = asyncio.get_running_loop().create_future()
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+        self._wake()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if not self.closed.done():
+            self.closed.set_result(None)
+        self._wake()
+
+    async def drain(self) -> None:
+        if not self.paused or self.closed.done():
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    def _wake(self) -> None:
+        while len(self._waiters) > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class TealAsyncWriter:
+    """Writes to a pipe or terminal through a write pipe transport of the running event loop, so that writing
+    never blocks the loop. When the pipe is full, write() waits until the reader has made room for the data.
+    The transport writes to its own file description of the stream, so that the non-blocking mode it needs doesn't
+    affect print() and other threads that write to the stream.
+    Only available where the stream can be opened again through /proc/self/fd, i.e. on Linux.
+    The transports are closed when the loop shuts down its async generators, e.g. at the end of asyncio.run().
+    """
+
+    # Writers of each event loop, by the file descriptor of the stream they write to
+    _writers: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Future]]" = WeakKeyDictionary()
+    # Closes the writers of each loop when it shuts down
+    _closers: "WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGenerator[None, None]]" = WeakKeyDictionary()
+
+    def __init__(self, transport: asyncio.WriteTransport, protocol: _PipeProtocol) -> None:
+        self.transport = transport
+        self.protocol = protocol
+        # Pause as soon as anything is buffered, so write() only returns once the data is in the pipe. Keeps the
+        # order with messages that are written synchronously afterwards, and nothing is lost when the loop closes
+        transport.set_write_buffer_limits(high=0)
+
+    async def write(self, data: bytes) -> None:
+        """Write the data after everything written before, and wait until it has been written"""
+        self.transport.write(data)
+        await self.protocol.drain()
+
+    @staticmethod
+    async def get(fd: int) -> Optional["TealAsyncWriter"]:
+        """The writer of the running loop for the file descriptor, or None if it's not a pipe or terminal"""
+        loop = asyncio.get_running_loop()
+        writers = TealAsyncWriter._writers.get(loop)
+        if writers is None:
+            writers = {}
+            TealAsyncWriter._writers[loop] = writers
+            closer = TealAsyncWriter._close_on_shutdown(writers)
+            # Starting it registers it with the loop
+            await closer.__anext__()
+            TealAsyncWriter._closers[loop] = closer
+
+        connecting = writers.get(fd)
+        if connecting is None:
+            connecting = loop.create_task(TealAsyncWriter._connect(loop, fd))
+            writers[fd] = connecting
+        # Shielded, since other tasks can be waiting for the same writer
+        writer = await asyncio.shield(connecting)
+        if writer is not None and writer.protocol.closed.done():
+            # E.g. the reader of the pipe has gone away, the next write connects again
+            del writers[fd]
+            return None
+        return writer
+
+    @staticmethod
+    async def _close_on_shutdown(
+        writers: Dict[int, "asyncio.Future[Optional[TealAsyncWriter]]"],
+    ) -> AsyncGenerator[None, None]:
+        """Never finishes by itself, it's closed by the loop's shutdown_asyncgens() and then closes the writers"""
+        try:
+            yield
+        finally:
+            for connecting in writers.values():
+                if connecting.done() and not connecting.cancelled() and connecting.exception() is None:
+                    writer = connecting.result()
+                    if writer is not None:
+                        writer.transport.close()
+                        await writer.protocol.closed
+            writers.clear()
+
+    @staticmethod
+    async def _connect(loop: asyncio.AbstractEventLoop, fd: int) -> Optional["TealAsyncWriter"]:
+        try:
+            mode = os.fstat(fd).st_mode
+        except OSError:
+            return None
+        # Regular files can't be opened again without changing where they're written to, and sockets can't be
+        # opened at all
+        if not stat.S_ISFIFO(mode) and not stat.S_ISCHR(mode):
+            return None
+
+        try:
+            # Non-blocking, since opening a pipe without a reader would wait for one
+            new_fd = os.open(f"/proc/self/fd/{fd}", os.O_WRONLY | os.O_NONBLOCK | os.O_NOCTTY | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        pipe = os.fdopen(new_fd, "wb", buffering=0)
+        try:
+            transport, protocol = await loop.connect_write_pipe(_PipeProtocol, pipe)
+        except (OSError, ValueError, NotImplementedError):
+            pipe.close()
+            return None
+        return TealAsyncWriter(transport, protocol)  # type: ignore
+
+    @staticmethod
+    async def write_records(records: List[TealRecord]) -> None:
+        """Write the records to all sinks, in the order of TealConfig.sinks.
+        Streams are written through a TealAsyncWriter, other sinks are written in the default executor of the loop
+        """
+        stats = TealStats.active
+        start = perf_counter_ns() if stats is not None else 0
+        loop = asyncio.get_running_loop()
+        for sink in TealConfig.sinks:
+            if isinstance(sink, TealStreamSink):
+                stream = sink.get_stream()
+                fd = TealStreamSink._get_fd(stream)
+                writer = await TealAsyncWriter.get(fd) if fd is not None else None
+                if writer is not None:
+                    text = sink.render(records)
+                    if len(text) > 0:
+                        data = sink.add_footer(stream, text).encode(stream.encoding or "utf-8", "ignore")
+                        await writer.write(data)
+                        if stats is not None:
+                            stats.add_rendered(len(text))
+                            stats.add_written(len(data))
+                    continue
+            await loop.run_in_executor(None, sink.write, records)
+
+        if stats is not None:
+            stats.add_flush_latency(perf_counter_ns() - start)
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+import tempfile
+from threading import Thread
+from typing import List
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint
+from .tealasync import TealAsyncWriter
+from .tealsink import TealStreamSink
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Uses /proc/self/fd")
+
+
+pytestmark = pytest.mark.usefixtures("no_colors")
+
+
+@pytest.mark.parametrize(
+    "name,function,level,expected",
+    [
+        ("Error", TealPrint.aerror, TealLevel.info, "Message\n"),
+        ("Warning", TealPrint.awarning, TealLevel.info, "Message\n"),
+        ("Info", TealPrint.ainfo, TealLevel.info, "Message\n"),
+        ("Verbose hidden", TealPrint.averbose, TealLevel.info, ""),
+        ("Verbose", TealPrint.averbose, TealLevel.verbose, "Message\n"),
+        ("Debug hidden", TealPrint.adebug, TealLevel.verbose, ""),
+        ("Debug", TealPrint.adebug, TealLevel.debug, "Message\n"),
+    ],
+)
+def test_levels(name: str, function, level: TealLevel, expected: str, capsys) -> None:
+    print(name)
+    capsys.readouterr()
+    TealConfig.level = level
+
+    asyncio.run(function("Message"))
+
+    assert expected == capsys.readouterr().out
+
+
+def test_indentation_and_order_per_task(capsys) -> None:
+    TealConfig.indent_by = 2
+
+    async def task(name: str) -> None:
+        await TealPrint.ainfo(name, push_indent=True)
+        for i in range(3):
+            await TealPrint.ainfo(f"{name}{i}")
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        await asyncio.gather(task("a"), task("b"))
+
+    asyncio.run(main())
+
+    lines = capsys.readouterr().out.splitlines()
+    assert ["a", "  a0", "  a1", "  a2"] == [line for line in lines if line.strip().startswith("a")]
+    assert ["b", "  b0", "  b1", "  b2"] == [line for line in lines if line.strip().startswith("b")]
+
+
+def test_aflush_writes_batched_messages(capsys) -> None:
+    TealConfig.flush_level = TealLevel.warning
+    TealConfig.flush_interval = 60
+
+    async def main() -> None:
+        TealPrint.info("Batched")
+        assert "" == capsys.readouterr().out
+        await TealPrint.aflush()
+
+    asyncio.run(main())
+
+    assert "Batched\n" == capsys.readouterr().out
+
+
+@linux_only
+def test_writes_through_pipe_without_blocking_the_loop() -> None:
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(write_fd, "w")
+    TealConfig.sinks = [TealStreamSink(stream)]
+    received: List[bytes] = []
+    reader = Thread(target=_read_all, args=(read_fd, received))
+    reader.start()
+
+    # More than fits into the pipe, so that the transport has to wait for the reader
+    messages = [f"{i:04d}" + "x" * 1000 for i in range(200)]
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        ticker = asyncio.get_running_loop().create_task(tick())
+        assert await TealAsyncWriter.get(write_fd) is not None
+        for message in messages:
+            await TealPrint.ainfo(message)
+        ticker.cancel()
+
+    asyncio.run(main())
+    # The stream itself is still blocking for print() and other threads
+    assert os.get_blocking(write_fd)
+    stream.close()
+    reader.join()
+
+    assert "\n".join(messages) + "\n" == b"".join(received).decode()
+    assert ticks > 0
+
+
+@linux_only
+def test_regular_file_is_written_in_executor() -> None:
+    with tempfile.TemporaryFile("w+") as file:
+        TealConfig.sinks = [TealStreamSink(file)]
+
+        async def main() -> None:
+            assert await TealAsyncWriter.get(file.fileno()) is None
+            await TealPrint.ainfo("In a file")
+
+        asyncio.run(main())
+
+        file.seek(0)
+        assert "In a file\n" == file.read()
+
+
+def _read_all(fd: int, received: List[bytes]) -> None:
+    with os.fdopen(fd, "rb", buffering=0) as pipe:
+        while True:
+            data = pipe.read(4096)
+            if not data:
+                break
+            received.append(data)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class TealBackpressure(Enum):
+    block = 0  # Wait until the writer has made room in the queue (default)
+    drop_oldest = 1  # Discard the oldest queued message to make room
+    drop_newest = 2  # Discard the message that is being added
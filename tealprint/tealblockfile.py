@@ -0,0 +1,252 @@
+import atexit
+import struct
+import zlib
+from threading import Lock
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from .teallevel import TealLevel
+from .tealrecord import TealRecord
+from .tealrenderer import TealJsonRenderer
+from .tealsink import TealSink
+from .tealstats import TealStats
+
+# Magic, compressed size, uncompressed size, number of records, earliest time, latest time, bit mask of the levels
+_header = struct.Struct("<4sIIIddB")
+_magic = b"TLB1"
+
+
+class TealBlockInfo:
+    """The header of a block in a TealBlockFileSink file, read without decompressing the block"""
+
+    __slots__ = ("offset", "size", "count", "first", "last", "levels")
+
+    def __init__(self, offset: int, size: int, count: int, first: float, last: float, levels: int) -> None:
+        """
+        Args:
+            offset (int): Where the compressed records start in the file
+            size (int): Size of the compressed records
+            count (int): Number of records in the block
+            first (float): Time of the earliest record
+            last (float): Time of the latest record
+            levels (int): Bit mask of the levels of the records, 1 << level.value
+        """
+        self.offset = offset
+        self.size = size
+        self.count = count
+        self.first = first
+        self.last = last
+        self.levels = levels
+
+    def matches(
+        self, level: TealLevel = TealLevel.debug, since: Optional[float] = None, until: Optional[float] = None
+    ) -> bool:
+        """Check if the block can have records of the level or lower, in the time range"""
+        if self.levels & ((2 << level.value) - 1) == 0:
+            return False
+        if since is not None and self.last < since:
+            return False
+        if until is not None and self.first > until:
+            return False
+        return True
+
+
+class TealBlockFileSink(TealSink):
+    """Appends messages to a file in compressed blocks, for the output of long running jobs.
+    Each block starts with a header with its time range and levels, so that searching the file only decompresses the
+    blocks that can match, see TealBlockFileReader and `python -m tealprint`. Messages are stored as JSON Lines and
+    keep their indentation and colors.
+    A block is written when block_size bytes of messages have been collected, when an error is written, and when the
+    sink is closed or the program exits.
+    """
+
+    def __init__(
+        self, path: str, level: TealLevel = TealLevel.debug, block_size: int = 65536, compression: int = 6
+    ) -> None:
+        """
+        Args:
+            path (str): The file to append to, created if it doesn't exist
+            level (TealLevel): Highest level that is written to this sink
+            block_size (int): Uncompressed bytes of messages that are collected before they're compressed as a block
+            compression (int): zlib compression level, 1 is fastest and 9 compresses the most
+        """
+        super().__init__(level, TealJsonRenderer())
+        self.path = path
+        self.block_size = block_size
+        self.compression = compression
+        self._file: Optional[BinaryIO] = None
+        # Compression is slow compared to writing to the console, so it doesn't hold the lock of all sinks
+        self._lock = Lock()
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._count = 0
+        self._first = 0.0
+        self._last = 0.0
+        self._levels = 0
+        # Messages can still come after closing, e.g. batched messages flushed before exiting after close() ran
+        self._closed = False
+
+    def write(self, records: List[TealRecord]) -> None:
+        if self.level != TealLevel.debug:
+            records = [record for record in records if record.level.value <= self.level.value]
+        if len(records) == 0:
+            return
+
+        data = self.get_renderer().render_records(records).encode("utf-8")
+        stats = TealStats.active
+        if stats is not None:
+            stats.add_rendered(len(data))
+
+        with self._lock:
+            if self._count == 0:
+                self._first = records[0].timestamp
+                self._last = records[0].timestamp
+            self._pending.append(data)
+            self._pending_size += len(data)
+            self._count += len(records)
+            error = False
+            # Flushes of other threads, batched buffers and workers aren't written in time order
+            first = self._first
+            last = self._last
+            for record in records:
+                self._levels |= 1 << record.level.value
+                error = error or record.level == TealLevel.error
+                timestamp = record.timestamp
+                if timestamp < first:
+                    first = timestamp
+                elif timestamp > last:
+                    last = timestamp
+            self._first = first
+            self._last = last
+
+            if error or self._closed or self._pending_size >= self.block_size:
+                self._write_block()
+
+    def flush(self) -> None:
+        """Write the collected messages as a block, even if it's smaller than block_size"""
+        with self._lock:
+            self._write_block()
+
+    def close(self) -> None:
+        """Write the collected messages and close the file. Messages written after this are written as a block
+        directly, with the file only opened while writing it
+        """
+        with self._lock:
+            self._closed = True
+            self._write_block()
+            self._close_file()
+
+    def _write_block(self) -> None:
+        """Compress the collected messages and write them with their header. Called while holding the lock"""
+        if self._count == 0:
+            return
+
+        data = b"".join(self._pending)
+        compressed = zlib.compress(data, self.compression)
+        header = _header.pack(_magic, len(compressed), len(data), self._count, self._first, self._last, self._levels)
+        if self._file is None:
+            self._file = open(self.path, "ab")
+            if not self._closed:
+                atexit.register(self.close)
+        # One write, so that blocks of processes appending to the same file aren't mixed
+        self._file.write(header + compressed)
+        self._file.flush()
+        if self._closed:
+            self._close_file()
+
+        if TealStats.active is not None:
+            TealStats.active.add_written(len(header) + len(compressed))
+        self._pending = []
+        self._pending_size = 0
+        self._count = 0
+        self._levels = 0
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            atexit.unregister(self.close)
+
+
+class TealBlockFileReader:
+    """Reads the records of a TealBlockFileSink file, and only decompresses the blocks that can match a filter"""
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): The file written by TealBlockFileSink
+        """
+        self.path = path
+
+    def index(self) -> Iterator[TealBlockInfo]:
+        """The headers of all blocks. Stops at a block that hasn't been written completely"""
+        with open(self.path, "rb") as file:
+            yield from self._index(file)
+
+    def records(
+        self,
+        level: TealLevel = TealLevel.debug,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        contains: Optional[str] = None,
+    ) -> Iterator[TealRecord]:
+        """The records that match all filters, in the order they were written
+
+        Args:
+            level (TealLevel): Highest level of the records
+            since (Optional[float]): Only records at or after this time, in seconds since the epoch
+            until (Optional[float]): Only records at or before this time, in seconds since the epoch
+            contains (Optional[str]): Only records whose message contains this text
+        """
+        import json
+
+        with open(self.path, "rb") as file:
+            for block in self._index(file):
+                if not block.matches(level, since, until):
+                    continue
+
+                file.seek(block.offset)
+                data = zlib.decompress(file.read(block.size)).decode("utf-8")
+                for line in data.splitlines():
+                    record = TealBlockFileReader.to_record(json.loads(line))
+                    if record.level.value > level.value:
+                        continue
+                    if since is not None and record.timestamp < since:
+                        continue
+                    if until is not None and record.timestamp > until:
+                        continue
+                    if contains is not None and contains not in record.get_message():
+                        continue
+                    yield record
+
+    def _index(self, file: BinaryIO) -> Iterator[TealBlockInfo]:
+        offset = 0
+        while True:
+            file.seek(offset)
+            header = file.read(_header.size)
+            if len(header) < _header.size:
+                return
+            magic, size, _, count, first, last, levels = _header.unpack(header)
+            if magic != _magic:
+                raise ValueError(f"{self.path} isn't a TealBlockFileSink file, or is corrupt at byte {offset}")
+            offset += _header.size
+            # The file might still be written to, or the program stopped while writing
+            file.seek(0, 2)
+            if file.tell() < offset + size:
+                return
+            yield TealBlockInfo(offset, size, count, first, last, levels)
+            offset += size
+
+    @staticmethod
+    def to_record(fields: Dict[str, Any]) -> TealRecord:
+        """Create the record from the fields of TealJsonRenderer.to_dict()"""
+        return TealRecord(
+            TealLevel[fields["level"]],
+            fields["message"],
+            (),
+            fields.get("color", ""),
+            fields["indent"],
+            fields["time"],
+            fields["thread"],
+            fields.get("worker"),
+            fields.get("channel"),
+        )
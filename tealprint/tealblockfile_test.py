@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+import zlib
+from typing import List
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, tealblockfile
+from .tealblockfile import TealBlockFileReader, TealBlockFileSink
+from .tealrecord import TealRecord
+
+pytestmark = pytest.mark.usefixtures("no_colors")
+
+
+def write(sink: TealBlockFileSink, level: TealLevel, message: str, timestamp: float, indent: int = 0) -> None:
+    sink.write([TealRecord(level, message, (), "", indent, timestamp)])
+
+
+def test_writes_blocks_with_index(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    sink = TealBlockFileSink(path, block_size=1)
+    write(sink, TealLevel.info, "First", 100.0)
+    write(sink, TealLevel.debug, "Second", 200.0)
+    sink.close()
+
+    blocks = list(TealBlockFileReader(path).index())
+
+    assert 2 == len(blocks)
+    assert (100.0, 100.0, 1, 1 << TealLevel.info.value) == (
+        blocks[0].first,
+        blocks[0].last,
+        blocks[0].count,
+        blocks[0].levels,
+    )
+    assert 1 << TealLevel.debug.value == blocks[1].levels
+
+
+def test_index_has_time_range_of_records_out_of_order(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    sink = TealBlockFileSink(path)
+    write(sink, TealLevel.info, "late", 100.0)
+    sink.write(
+        [TealRecord(TealLevel.info, "early", (), "", 0, 10.0), TealRecord(TealLevel.info, "middle", (), "", 0, 50.0)]
+    )
+    sink.close()
+
+    reader = TealBlockFileReader(path)
+
+    assert [(10.0, 100.0)] == [(block.first, block.last) for block in reader.index()]
+    assert ["early"] == [record.get_message() for record in reader.records(until=20.0)]
+
+
+def test_collects_until_block_size_or_error(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    sink = TealBlockFileSink(path, block_size=1000)
+    write(sink, TealLevel.info, "Collected", 1.0)
+    assert not os.path.exists(path)
+
+    write(sink, TealLevel.error, "Written directly", 2.0)
+    assert [2] == [block.count for block in TealBlockFileReader(path).index()]
+    sink.close()
+
+
+@pytest.mark.parametrize(
+    "name,filters,expected,decompressed",
+    [
+        ("All", {}, ["e1", "i1", "d2", "i3"], 4),
+        ("Level", {"level": TealLevel.info}, ["e1", "i1", "i3"], 3),
+        ("Since", {"since": 200.0}, ["d2", "i3"], 2),
+        ("Until", {"until": 150.0}, ["e1", "i1"], 2),
+        ("Contains", {"contains": "3"}, ["i3"], 4),
+        ("Nothing", {"level": TealLevel.error, "since": 200.0}, [], 0),
+    ],
+)
+def test_filters_and_skips_blocks(name: str, filters, expected: List[str], decompressed: int, tmp_path, monkeypatch):
+    print(name)
+    path = str(tmp_path / "job.tlb")
+    sink = TealBlockFileSink(path, block_size=1000)
+    # Errors are written as a block directly
+    write(sink, TealLevel.error, "e1", 100.0)
+    write(sink, TealLevel.info, "i1", 110.0)
+    sink.flush()
+    write(sink, TealLevel.debug, "d2", 200.0)
+    sink.flush()
+    write(sink, TealLevel.info, "i3", 300.0)
+    sink.close()
+
+    calls = []
+    original = zlib.decompress
+
+    def decompress(data: bytes) -> bytes:
+        calls.append(1)
+        return original(data)
+
+    monkeypatch.setattr(tealblockfile.zlib, "decompress", decompress)
+    records = TealBlockFileReader(path).records(**filters)
+
+    assert expected == [record.get_message() for record in records]
+    assert decompressed == len(calls)
+
+
+def test_writes_messages_flushed_after_closing(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    code = "\n".join(
+        [
+            "from tealprint import TealBlockFileSink, TealConfig, TealLevel, TealPrint",
+            f"TealConfig.sinks = [TealBlockFileSink({path!r})]",
+            "TealConfig.flush_level = TealLevel.warning",
+            "TealConfig.flush_interval = 60",
+            # Writes a block, after which the sink closes itself before the batched message is flushed on exit
+            "TealPrint.error('First')",
+            "TealPrint.info('Batched')",
+        ]
+    )
+
+    subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+    assert ["First", "Batched"] == [record.get_message() for record in TealBlockFileReader(path).records()]
+
+
+def test_stops_at_incomplete_block(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    sink = TealBlockFileSink(path, block_size=1)
+    write(sink, TealLevel.info, "Complete", 1.0)
+    write(sink, TealLevel.info, "Cut off", 2.0)
+    sink.close()
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)
+
+    assert ["Complete"] == [record.get_message() for record in TealBlockFileReader(path).records()]
+
+
+def test_not_a_block_file(tmp_path) -> None:
+    path = str(tmp_path / "log.txt")
+    with open(path, "w") as file:
+        file.write("Plain text, not blocks\n" * 3)
+
+    with pytest.raises(ValueError):
+        list(TealBlockFileReader(path).records())
+
+
+def test_command_line_renders_with_indentation(tmp_path) -> None:
+    path = str(tmp_path / "job.tlb")
+    TealConfig.sinks = [TealBlockFileSink(path)]
+    TealPrint.info("Header", push_indent=True)
+    TealPrint.warning("Indented warning")
+    TealPrint.info("Indented info about a timeout")
+    TealPrint.pop_indent()
+    TealConfig.sinks[0].close()
+
+    result = subprocess.run(
+        [sys.executable, "-m", "tealprint", path, "--level", "info", "--contains", "Indented"],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert "    Indented warning\n    Indented info about a timeout\n" == result.stdout
@@ -0,0 +1,230 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from .tealconfig import TealConfig
+from .tealflusher import TealFlusher
+from .teallevel import TealLevel
+from .tealratelimiter import TealRateLimiter
+from .tealrecord import TealMessage
+
+# Cached level of a channel that has to be looked up again. Higher than all levels, so that the check whether a level
+# is hidden lets it through to where it's looked up
+_stale = 99
+
+
+class TealChannel:
+    """A named source of messages with its own level, e.g. for a subsystem. Names are dotted, like "db.pool".
+    The level of a channel is the level set for it, otherwise the level of the closest channel above it, e.g. "db",
+    otherwise TealConfig.level. The level is looked up once and cached, until a level is changed.
+    Use TealPrint.channel() to get a channel. Indentation is shared with TealPrint, and pushed indentation is shown
+    according to TealConfig.level.
+
+    For example:
+        pool = TealPrint.channel("db.pool")
+        TealPrint.channel("db").level = TealLevel.debug
+        pool.debug("Shown, even though TealConfig.level is info")
+    """
+
+    _channels: Dict[str, "TealChannel"] = {}
+    _lock = Lock()
+
+    def __init__(self, name: str) -> None:
+        """Use TealPrint.channel() instead, so that each name has a single channel
+
+        Args:
+            name (str): Dotted name of the channel
+        """
+        self.name = name
+        # Value of the level the channel shows, or _stale
+        self._effective = _stale
+        self._level = TealLevel.info
+
+    @property
+    def level(self) -> Optional[TealLevel]:
+        """The level set for this channel, or None if it uses the level of the channel above it"""
+        return TealConfig.channel_levels.get(self.name)
+
+    @level.setter
+    def level(self, level: Optional[TealLevel]) -> None:
+        levels = dict(TealConfig.channel_levels)
+        if level is None:
+            levels.pop(self.name, None)
+        else:
+            levels[self.name] = level
+        # Assigning a new dict makes all channels look up their level again
+        TealConfig.channel_levels = levels
+
+    def get_level(self) -> TealLevel:
+        """The level that this channel shows"""
+        if self._effective != _stale:
+            return self._level
+
+        while True:
+            version = TealConfig._version
+            level = self._lookup_level()
+            self._level = level
+            self._effective = level.value
+            # The levels might have changed while looking it up, and the cache been cleared before it was set
+            if version == TealConfig._version:
+                return level
+
+    def _lookup_level(self) -> TealLevel:
+        levels = TealConfig.channel_levels
+        name = self.name
+        while True:
+            level = levels.get(name)
+            if level is not None:
+                return level
+            dot = name.rfind(".")
+            if dot < 0:
+                return TealConfig.level
+            name = name[:dot]
+
+    def is_enabled(self, level: TealLevel) -> bool:
+        """Check if messages of this level would be printed in this channel
+
+        Args:
+            level (TealLevel): The level to check
+        """
+        return self.get_level().value >= level.value
+
+    def error(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = TealConfig.colors_default.error,
+        exit: bool = False,
+        print_exception: bool = False,
+        print_report_this: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Same as TealPrint.error(), with the level of the channel"""
+        if self._effective < TealLevel.error.value and not exit:
+            TealPrint._skip(TealLevel.error, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.error(
+            message,
+            push_indent,
+            pop_indent,
+            color,
+            exit,
+            print_exception,
+            print_report_this,
+            args,
+            TealRateLimiter.callsite(key, 1),
+            self,
+        )
+        if TealLevel.error.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    def warning(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = TealConfig.colors_default.warning,
+        exit: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Same as TealPrint.warning(), with the level of the channel"""
+        if self._effective < TealLevel.warning.value:
+            TealPrint._skip(TealLevel.warning, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.warning(message, push_indent, pop_indent, color, exit, args, TealRateLimiter.callsite(key, 1), self)
+        if TealLevel.warning.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    def info(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Same as TealPrint.info(), with the level of the channel"""
+        if self._effective < TealLevel.info.value:
+            TealPrint._skip(TealLevel.info, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.info(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1), self)
+        if TealLevel.info.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    def verbose(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Same as TealPrint.verbose(), with the level of the channel"""
+        if self._effective < TealLevel.verbose.value:
+            TealPrint._skip(TealLevel.verbose, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.verbose(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1), self)
+        if TealLevel.verbose.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    def debug(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Same as TealPrint.debug(), with the level of the channel"""
+        if self._effective < TealLevel.debug.value:
+            TealPrint._skip(TealLevel.debug, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.debug(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1), self)
+        if TealLevel.debug.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    @staticmethod
+    def get(name: str) -> "TealChannel":
+        """The channel with the name, created the first time"""
+        channel = TealChannel._channels.get(name)
+        if channel is None:
+            with TealChannel._lock:
+                channel = TealChannel._channels.setdefault(name, TealChannel(name))
+        return channel
+
+    @staticmethod
+    def _invalidate() -> None:
+        """Make all channels look up their level again, called whenever TealConfig changes"""
+        for channel in list(TealChannel._channels.values()):
+            channel._effective = _stale
+
+
+TealConfig._listeners.append(TealChannel._invalidate)
+
+# Channels print through TealPrint, which imports them
+from .tealprint import TealPrint  # noqa: E402
@@ -0,0 +1,77 @@
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint
+from .tealrenderer import TealJsonRenderer
+from .tealsink import TealStreamSink
+
+pytestmark = pytest.mark.usefixtures("no_colors")
+
+
+@pytest.mark.parametrize(
+    "name,levels,channel,expected",
+    [
+        ("Uses TealConfig.level", {}, "db.pool", "info\n"),
+        ("Own level", {"db.pool": TealLevel.debug}, "db.pool", "info\nverbose\ndebug\n"),
+        ("Level of parent", {"db": TealLevel.verbose}, "db.pool", "info\nverbose\n"),
+        (
+            "Closest parent",
+            {"db": TealLevel.error, "db.pool": TealLevel.debug},
+            "db.pool.conn",
+            "info\nverbose\ndebug\n",
+        ),
+        ("Lower than TealConfig.level", {"db": TealLevel.none}, "db.pool", ""),
+        ("Sibling isn't a parent", {"db.pool": TealLevel.debug}, "db.poolx", "info\n"),
+    ],
+)
+def test_effective_level(name: str, levels, channel: str, expected: str, capsys) -> None:
+    print(name)
+    capsys.readouterr()
+    TealConfig.channel_levels = levels
+
+    TealPrint.channel(channel).info("info")
+    TealPrint.channel(channel).verbose("verbose")
+    TealPrint.channel(channel).debug("debug")
+
+    assert expected == capsys.readouterr().out
+
+
+def test_same_channel_for_same_name() -> None:
+    assert TealPrint.channel("a.b") is TealPrint.channel("a.b")
+
+
+def test_level_changes_are_noticed(capsys) -> None:
+    channel = TealPrint.channel("net")
+    channel.debug("Hidden")
+    assert TealLevel.info == channel.get_level()
+
+    TealPrint.channel("net").level = TealLevel.debug
+    channel.debug("Shown")
+    assert TealLevel.debug == channel.level
+
+    channel.level = None
+    TealConfig.level = TealLevel.verbose
+    channel.debug("Hidden")
+    channel.verbose("Shown too")
+
+    assert "Shown\nShown too\n" == capsys.readouterr().out
+
+
+def test_indentation_follows_tealconfig_level(capsys) -> None:
+    TealConfig.indent_by = 2
+    channel = TealPrint.channel("quiet")
+    channel.level = TealLevel.warning
+
+    channel.info("Hidden", push_indent=True)
+    TealPrint.info("Indented")
+    channel.info("Hidden", pop_indent=True)
+    TealPrint.info("Done")
+
+    assert "  Indented\nDone\n" == capsys.readouterr().out
+
+
+def test_json_has_channel(capsys) -> None:
+    TealConfig.sinks = [TealStreamSink(renderer=TealJsonRenderer())]
+
+    TealPrint.channel("db").warning("Slow query")
+
+    assert '"channel": "db"' in capsys.readouterr().out
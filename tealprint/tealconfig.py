@@ -1,20 +1,59 @@
-from colored import fg
+from typing import TYPE_CHECKING, Callable, Dict, List
 
 from .teallevel import TealLevel
 
+if TYPE_CHECKING:
+    from .tealsink import TealSink
+
 
 class Colors:
-    error: str = fg("red")
-    warning: str = fg("dark_orange")
+    # Same as colored's fg("red") and fg("dark_orange"), without having to import colored
+    error: str = "\x1b[38;5;1m"
+    warning: str = "\x1b[38;5;208m"
+    reset: str = "\x1b[0m"
+
+
+class _TealConfigMeta(type):
+    def __setattr__(cls, name: str, value) -> None:
+        super().__setattr__(name, value)
+        # Bump the version so that values derived from the config are recalculated
+        if not name.startswith("_"):
+            super().__setattr__("_version", cls._version + 1)
+            # For cached values that can't check the version, because that would be too slow
+            for listener in cls._listeners:
+                listener()
 
 
-class TealConfig:
+class TealConfig(metaclass=_TealConfigMeta):
     level: TealLevel = TealLevel.info
     indent_char = " "
     indent_by: int = 4
     colors_enabled: bool = True
     unicode_enabled: bool = True
     colors_default: Colors = Colors()
+    sinks: List["TealSink"] = []
+    collapse_repeated: bool = False  # Print identical consecutive messages once, then a "repeated N times" line
+    collapse_summary_interval: float = 5.0  # Seconds between "repeated N times" lines while a message repeats
+    rate_limit: float = 0  # Messages per second allowed for each callsite or key, 0 to disable
+    rate_limit_burst: int = 10  # Messages allowed at once before rate_limit applies
+    sample_every: int = 0  # Print 1 in N debug and verbose messages of each callsite or key, 0 to print all
+    sample_rate: float = 0  # Print at most this many debug and verbose messages per second of each callsite or key
+    sample_report_interval: float = 5.0  # Minimum seconds between "N messages were skipped" lines of a callsite
+    status_refresh_rate: float = 10.0  # Maximum times per second that the status line is redrawn in a terminal
+    status_fallback_interval: float = 5.0  # Seconds between status lines when they can't be updated in place
+    flush_level: TealLevel = TealLevel.debug  # TealPrint flushes directly for this level and lower, others are batched
+    flush_bytes: int = 65536  # Flush batched messages when they're about this many characters
+    flush_interval: float = 0.1  # Flush batched messages when the first one has waited this many seconds
+    buffer_max_size: int = 4 * 1024 * 1024  # Flush a buffer early at about this many characters, 0 for no limit
+    exception_dedupe: bool = True  # Only print the traceback the first time the same exception is printed
+    exception_max_frames: int = 0  # Only print the last frames of each traceback, 0 to print all of them
+    exception_chain: bool = True  # Also print the exceptions that caused the exception
+    # Levels of TealChannels by name, used for the channel and the channels below it. Set TealChannel.level, or assign
+    # a new dict, changing the dict itself isn't noticed
+    channel_levels: Dict[str, TealLevel] = {}
+    _version: int = 0
+    # Called after any setting has changed
+    _listeners: List[Callable[[], None]] = []
 
     @staticmethod
     def reset():
@@ -24,3 +63,27 @@ class TealConfig:
         TealConfig.colors_enabled = True
         TealConfig.unicode_enabled = True
         TealConfig.colors_default = Colors()
+        TealConfig.sinks = [TealStreamSink()]
+        TealConfig.collapse_repeated = False
+        TealConfig.collapse_summary_interval = 5.0
+        TealConfig.rate_limit = 0
+        TealConfig.rate_limit_burst = 10
+        TealConfig.sample_every = 0
+        TealConfig.sample_rate = 0
+        TealConfig.sample_report_interval = 5.0
+        TealConfig.status_refresh_rate = 10.0
+        TealConfig.status_fallback_interval = 5.0
+        TealConfig.flush_level = TealLevel.debug
+        TealConfig.flush_bytes = 65536
+        TealConfig.flush_interval = 0.1
+        TealConfig.buffer_max_size = 4 * 1024 * 1024
+        TealConfig.exception_dedupe = True
+        TealConfig.exception_max_frames = 0
+        TealConfig.exception_chain = True
+        TealConfig.channel_levels = {}
+
+
+# Sinks render with TealConfig, so they can only be imported once it exists
+from .tealsink import TealStreamSink  # noqa: E402
+
+TealConfig.sinks = [TealStreamSink()]
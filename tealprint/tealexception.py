@@ -0,0 +1,95 @@
+import sys
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from .tealconfig import TealConfig
+from .tealrecord import TealMessage
+
+
+class TealException:
+    """Formats the current exception for TealPrint.error(print_exception=True).
+    The first time an exception is printed, its whole traceback is printed with a number. When the same exception,
+    i.e. the same type raised from the same lines, is printed again, only a line referring to that number is printed.
+    """
+
+    # Maximum number of different exceptions that are remembered, the oldest is forgotten first
+    max_remembered = 1000
+
+    _lock = Lock()
+    # Fingerprint of each printed exception, mapped to [number, times seen]
+    _seen: Dict[Tuple[Any, ...], List[int]] = {}
+    _count = 0
+
+    @staticmethod
+    def get_message() -> Optional[TealMessage]:
+        """The message for the exception that is being handled, or None if there's no exception.
+        The traceback is only formatted when the message is rendered
+        """
+        exception = sys.exc_info()[1]
+        if exception is None:
+            return None
+        if not TealConfig.exception_dedupe:
+            return lambda: TealException.format(exception)
+
+        fingerprint = TealException.fingerprint(exception)
+        with TealException._lock:
+            seen = TealException._seen.get(fingerprint)
+            if seen is None:
+                TealException._count += 1
+                seen = [TealException._count, 1]
+                if len(TealException._seen) >= TealException.max_remembered:
+                    del TealException._seen[next(iter(TealException._seen))]
+                TealException._seen[fingerprint] = seen
+                first = True
+            else:
+                seen[1] += 1
+                first = False
+            number, count = seen
+
+        if first:
+            return lambda: f"[#{number}] {TealException.format(exception)}"
+        return f"{type(exception).__name__}: {exception} (same as #{number}, seen {count} times)"
+
+    @staticmethod
+    def fingerprint(exception: BaseException) -> Tuple[Any, ...]:
+        """The type of the exception and the lines in its traceback, including chained exceptions"""
+        parts: List[Any] = []
+        current: Optional[BaseException] = exception
+        # Guard against cycles in the chain
+        visited = set()
+        while current is not None and id(current) not in visited:
+            visited.add(id(current))
+            lines = []
+            traceback = current.__traceback__
+            while traceback is not None:
+                lines.append((traceback.tb_frame.f_code.co_filename, traceback.tb_lineno))
+                traceback = traceback.tb_next
+            parts.append((type(current), tuple(lines)))
+
+            if not TealConfig.exception_chain:
+                break
+            if current.__cause__ is not None:
+                current = current.__cause__
+            elif not current.__suppress_context__:
+                current = current.__context__
+            else:
+                current = None
+        return tuple(parts)
+
+    @staticmethod
+    def format(exception: BaseException) -> str:
+        """Format the traceback, limited to the last TealConfig.exception_max_frames frames of each exception"""
+        import traceback
+
+        limit = -TealConfig.exception_max_frames if TealConfig.exception_max_frames > 0 else None
+        lines = traceback.format_exception(
+            type(exception), exception, exception.__traceback__, limit=limit, chain=TealConfig.exception_chain
+        )
+        return "".join(lines).rstrip("\n")
+
+    @staticmethod
+    def reset() -> None:
+        """Forget all printed exceptions, so that they're printed completely again"""
+        with TealException._lock:
+            TealException._seen.clear()
+            TealException._count = 0
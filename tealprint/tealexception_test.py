@@ -0,0 +1,103 @@
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint
+from .tealexception import TealException
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    TealConfig.colors_enabled = False
+    TealException.reset()
+    yield
+    TealException.reset()
+    TealConfig.reset()
+
+
+def fail(value: int) -> None:
+    raise ValueError(f"Failed {value}")
+
+
+def print_failure(value: int) -> None:
+    try:
+        fail(value)
+    except ValueError:
+        TealPrint.error("Error", print_exception=True)
+
+
+def test_prints_traceback_once(capsys) -> None:
+    for i in range(3):
+        print_failure(i)
+
+    lines = capsys.readouterr().out.splitlines()
+
+    assert "[#1] Traceback (most recent call last):" == lines[1]
+    assert "ValueError: Failed 0" == lines[-5]
+    assert ["Error", "ValueError: Failed 1 (same as #1, seen 2 times)"] == lines[-4:-2]
+    assert ["Error", "ValueError: Failed 2 (same as #1, seen 3 times)"] == lines[-2:]
+
+
+def test_different_lines_are_different_exceptions(capsys) -> None:
+    print_failure(0)
+    try:
+        fail(1)
+    except ValueError:
+        TealPrint.error("Error", print_exception=True)
+
+    output = capsys.readouterr().out
+
+    assert "[#1] Traceback" in output
+    assert "[#2] Traceback" in output
+
+
+def test_prints_every_traceback_without_dedupe(capsys) -> None:
+    TealConfig.exception_dedupe = False
+    print_failure(0)
+    print_failure(1)
+
+    output = capsys.readouterr().out
+
+    assert 2 == output.count("Traceback (most recent call last):")
+    assert "same as" not in output
+
+
+def test_max_frames(capsys) -> None:
+    TealConfig.exception_max_frames = 1
+    print_failure(0)
+
+    output = capsys.readouterr().out
+
+    assert "in fail" in output
+    assert "in print_failure" not in output
+
+
+@pytest.mark.parametrize(
+    "name,chain,expected",
+    [
+        ("Prints the cause", True, True),
+        ("Only prints the last exception", False, False),
+    ],
+)
+def test_chained_exceptions(name: str, chain: bool, expected: bool, capsys) -> None:
+    print(name)
+    TealConfig.exception_chain = chain
+    try:
+        try:
+            fail(0)
+        except ValueError as error:
+            raise RuntimeError("Wrapped") from error
+    except RuntimeError:
+        TealPrint.error("Error", print_exception=True)
+
+    output = capsys.readouterr().out
+
+    assert "RuntimeError: Wrapped" in output
+    assert expected == ("ValueError: Failed 0" in output)
+
+
+def test_not_formatted_when_errors_are_hidden(capsys) -> None:
+    TealConfig.level = TealLevel.none
+    print_failure(0)
+    TealConfig.level = TealLevel.info
+    print_failure(1)
+
+    assert "[#1] Traceback" in capsys.readouterr().out
@@ -0,0 +1,36 @@
+from collections import deque
+from typing import Deque, List, Optional
+
+from .teallevel import TealLevel
+from .tealrecord import TealRecord
+
+
+class TealFlightRecorder:
+    """Keeps the latest hidden messages in memory, so that they can be printed when an error occurs.
+    Messages are stored as is, and are only formatted and rendered when they are dumped.
+    """
+
+    active: Optional["TealFlightRecorder"] = None
+
+    def __init__(self, capacity: int = 1000, level: TealLevel = TealLevel.debug) -> None:
+        """
+        Args:
+            capacity (int): Maximum number of messages to keep, the oldest messages are discarded first
+            level (TealLevel): Highest level of hidden messages to keep
+        """
+        self.level = level
+        self.records: Deque[TealRecord] = deque(maxlen=capacity)
+
+    def record(self, record: TealRecord) -> None:
+        if record.level.value <= self.level.value:
+            self.records.append(record)
+
+    def take(self) -> List[TealRecord]:
+        """Removes and returns all kept messages, oldest first"""
+        records = []
+        try:
+            while True:
+                records.append(self.records.popleft())
+        except IndexError:
+            pass
+        return records
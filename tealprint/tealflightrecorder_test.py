@@ -0,0 +1,57 @@
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint
+
+indent = "".ljust(TealConfig.indent_by, TealConfig.indent_char)
+
+
+@pytest.fixture(autouse=True)
+def flight_recorder():
+    TealConfig.level = TealLevel.info
+    TealConfig.colors_enabled = False
+    TealPrint.enable_flight_recorder(capacity=2)
+    yield
+    TealPrint.disable_flight_recorder()
+    TealConfig.reset()
+
+
+def test_hidden_messages_printed_before_error(capsys) -> None:
+    TealPrint.info("Saving", push_indent=True)
+    TealPrint.debug("Opening %s", args=("file",))
+    TealPrint.verbose(lambda: "Writing")
+    TealPrint.error("Failed")
+    TealPrint.pop_indent()
+
+    assert f"Saving\n{indent}Opening file\n{indent}Writing\n{indent}Failed\n" == capsys.readouterr().out
+
+
+def test_keeps_only_latest_messages(capsys) -> None:
+    for i in range(5):
+        TealPrint.debug(f"{i}")
+    TealPrint.dump_flight_recorder()
+
+    assert "3\n4\n" == capsys.readouterr().out
+
+
+def test_messages_are_only_dumped_once(capsys) -> None:
+    TealPrint.debug("Debug")
+    TealPrint.error("First")
+    TealPrint.error("Second")
+
+    assert "Debug\nFirst\nSecond\n" == capsys.readouterr().out
+
+
+def test_dumped_when_exiting(capsys) -> None:
+    TealPrint.debug("Debug")
+
+    with pytest.raises(SystemExit):
+        TealPrint.warning("Exiting", exit=True)
+
+    assert "Debug\nExiting\n" == capsys.readouterr().out
+
+
+def test_messages_are_not_formatted_until_dumped() -> None:
+    calls = []
+    TealPrint.debug(lambda: calls.append(1) or "Debug")
+
+    assert [] == calls
@@ -0,0 +1,129 @@
+import atexit
+import os
+from threading import Condition, Thread
+from time import monotonic
+from typing import Optional, Set
+
+from .tealconfig import TealConfig
+from .tealprintbuffer import TealPrintBuffer
+
+
+class TealFlusher:
+    """Flushes the buffers of TealPrint that have batched messages, see TealConfig.flush_level.
+    A buffer is flushed when its messages are TealConfig.flush_bytes large, when the first message has waited for
+    TealConfig.flush_interval seconds, and when the program exits.
+    Also prints the "repeated N times" count of TealConfig.collapse_repeated once a message stops repeating.
+    """
+
+    # Buffers with messages that haven't been flushed
+    _pending: Set[TealPrintBuffer] = set()
+    # Buffers whose last message has been repeated without printing the count yet, see TealConfig.collapse_repeated
+    _repeating: Set[TealPrintBuffer] = set()
+    _condition = Condition()
+    _thread: Optional[Thread] = None
+
+    @staticmethod
+    def flush_later(buffer: TealPrintBuffer) -> None:
+        """Flush the buffer if it's large or old enough, otherwise flush it within TealConfig.flush_interval"""
+        now = monotonic()
+        if buffer.pending_since == 0.0:
+            buffer.pending_since = now
+            with TealFlusher._condition:
+                TealFlusher._pending.add(buffer)
+                TealFlusher._start()
+        elif now - buffer.pending_since >= TealConfig.flush_interval:
+            buffer.flush()
+            return
+
+        if buffer.get_size() >= TealConfig.flush_bytes:
+            buffer.flush()
+
+    @staticmethod
+    def flush_repeated_later(buffer: TealPrintBuffer) -> None:
+        """Print how many times the last message of the buffer has been repeated, once it hasn't been repeated for
+        TealConfig.flush_interval seconds
+        """
+        with TealFlusher._condition:
+            TealFlusher._repeating.add(buffer)
+            TealFlusher._start()
+
+    @staticmethod
+    def flush_all() -> None:
+        """Flush all buffers with batched messages or repeats whose count hasn't been printed"""
+        with TealFlusher._condition:
+            buffers = list(TealFlusher._pending)
+            TealFlusher._pending.clear()
+            repeating = list(TealFlusher._repeating)
+            TealFlusher._repeating.clear()
+        for buffer in buffers:
+            buffer.flush()
+        for buffer in repeating:
+            buffer.flush_repeated()
+
+    @staticmethod
+    def _start() -> None:
+        """Start the thread, or wake it up to check the new buffer. Called while holding the condition"""
+        if TealFlusher._thread is None:
+            TealFlusher._thread = Thread(target=TealFlusher._run, name="tealprint-flusher", daemon=True)
+            TealFlusher._thread.start()
+        else:
+            TealFlusher._condition.notify()
+
+    @staticmethod
+    def _run() -> None:
+        """Flushes buffers whose first message has waited for TealConfig.flush_interval"""
+        while True:
+            due = []
+            repeated = []
+            with TealFlusher._condition:
+                while len(TealFlusher._pending) == 0 and len(TealFlusher._repeating) == 0:
+                    TealFlusher._condition.wait()
+
+                now = monotonic()
+                wait = TealConfig.flush_interval
+                for buffer in list(TealFlusher._pending):
+                    pending_since = buffer.pending_since
+                    if pending_since == 0.0:
+                        # Already flushed by its thread
+                        TealFlusher._pending.discard(buffer)
+                    elif now - pending_since >= TealConfig.flush_interval:
+                        TealFlusher._pending.discard(buffer)
+                        due.append(buffer)
+                    else:
+                        wait = min(wait, pending_since + TealConfig.flush_interval - now)
+
+                for buffer in list(TealFlusher._repeating):
+                    last_repeat = buffer.last_repeat
+                    if buffer._repeated == 0:
+                        # The count has already been printed
+                        TealFlusher._repeating.discard(buffer)
+                    elif now - last_repeat >= TealConfig.flush_interval:
+                        TealFlusher._repeating.discard(buffer)
+                        repeated.append(buffer)
+                    else:
+                        wait = min(wait, last_repeat + TealConfig.flush_interval - now)
+
+                if len(due) == 0 and len(repeated) == 0:
+                    if len(TealFlusher._pending) > 0 or len(TealFlusher._repeating) > 0:
+                        TealFlusher._condition.wait(wait)
+
+            # Flushed without holding the condition, so that other threads can keep adding messages meanwhile
+            for buffer in due:
+                buffer.flush()
+            for buffer in repeated:
+                buffer.flush_repeated()
+
+    @staticmethod
+    def _reset_after_fork() -> None:
+        # The thread doesn't exist in the child, and the buffers belong to the parent
+        TealFlusher._pending = set()
+        TealFlusher._repeating = set()
+        TealFlusher._condition = Condition()
+        TealFlusher._thread = None
+
+
+# Write batched messages before the program exits
+atexit.register(TealFlusher.flush_all)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=TealFlusher._reset_after_fork)
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, TealPrintBuffer
+
+
+@pytest.fixture(autouse=True)
+def batch_info():
+    TealConfig.colors_enabled = False
+    TealConfig.flush_level = TealLevel.warning
+    TealConfig.flush_interval = 60
+    yield
+    TealConfig.reset()
+
+
+def test_flushes_batched_messages_with_important_message(capsys) -> None:
+    TealPrint.info("1")
+    TealPrint.debug("2")
+    assert "" == capsys.readouterr().out
+
+    TealPrint.warning("3")
+    assert "1\n3\n" == capsys.readouterr().out
+
+
+def test_flushes_when_size_is_reached(capsys) -> None:
+    TealConfig.flush_bytes = 12
+    TealPrint.info("1234")
+    TealPrint.info("5678")
+    assert "" == capsys.readouterr().out
+
+    TealPrint.info("9")
+    assert "1234\n5678\n9\n" == capsys.readouterr().out
+
+
+def test_flushes_after_interval(capsys) -> None:
+    TealConfig.flush_interval = 0.05
+    TealPrint.info("Waiting")
+    time.sleep(0.3)
+
+    assert "Waiting\n" == capsys.readouterr().out
+
+
+def test_flush_writes_batched_messages(capsys) -> None:
+    TealPrint.info("Batched")
+    TealPrint.flush()
+
+    assert "Batched\n" == capsys.readouterr().out
+
+
+def test_flushes_before_exit() -> None:
+    code = "\n".join(
+        [
+            "from tealprint import TealConfig, TealLevel, TealPrint",
+            "TealConfig.flush_level = TealLevel.error",
+            "TealConfig.flush_interval = 60",
+            "for i in range(10):",
+            "    TealPrint.info(str(i))",
+        ]
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert "".join(f"{i}\n" for i in range(10)) == result.stdout
+
+
+def test_flush_prints_repeated_count(capsys) -> None:
+    TealConfig.collapse_repeated = True
+    for _ in range(1000):
+        TealPrint.warning("connection refused, retrying")
+    TealPrint.flush()
+
+    assert "connection refused, retrying\n(repeated 999 more times)\n" == capsys.readouterr().out
+
+
+def test_prints_repeated_count_when_repeats_stop(capsys) -> None:
+    TealConfig.collapse_repeated = True
+    TealConfig.flush_interval = 0.05
+    for _ in range(3):
+        TealPrint.warning("connection reset, retrying")
+    time.sleep(0.3)
+
+    assert "connection reset, retrying\n(repeated 2 more times)\n" == capsys.readouterr().out
+
+
+def test_does_not_flush_buffers_of_others(capsys) -> None:
+    TealConfig.collapse_repeated = True
+    TealConfig.flush_interval = 0.05
+    buffer = TealPrintBuffer()
+    buffer.info("collected 1")
+    buffer.info("retry")
+    buffer.info("retry")
+    time.sleep(0.3)
+
+    assert "" == capsys.readouterr().out
+    assert "collected 1\nretry\n" == buffer.getvalue()
+
+
+def test_prints_repeated_count_before_exit() -> None:
+    code = "\n".join(
+        [
+            "from tealprint import TealConfig, TealPrint",
+            "TealConfig.collapse_repeated = True",
+            "TealConfig.flush_interval = 60",
+            "for i in range(1000):",
+            "    TealPrint.warning('connection refused, retrying')",
+        ]
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert "connection refused, retrying\n(repeated 999 more times)\n" in result.stdout
@@ -0,0 +1,133 @@
+import logging
+from threading import local
+from typing import List, Optional, Union
+
+from .tealconfig import TealConfig
+from .tealflusher import TealFlusher
+from .teallevel import TealLevel
+from .tealprint import TealPrint
+from .tealrecord import TealRecord
+from .tealrenderer import TealRenderer
+from .tealsink import TealSink
+
+# Set while TealLoggingSink forwards records to logging, so that a TealLoggingHandler in the same logger
+# hierarchy doesn't send them back
+_forwarding = local()
+
+
+class TealLoggingHandler(logging.Handler):
+    """Prints records from the logging module with TealPrint, e.g. from third-party libraries.
+    Records are added to the buffer of the current thread, with its indentation, and flushed in batches.
+    Records of levels that TealConfig.level hides are skipped before they are filtered or formatted.
+
+    Example:
+        logging.basicConfig(level=logging.DEBUG, handlers=[TealLoggingHandler()])
+    """
+
+    def __init__(self, batch_size: int = 100) -> None:
+        """
+        Args:
+            batch_size (int): Flush when this many messages are in the buffer. Otherwise messages are flushed when
+                the oldest has waited TealConfig.flush_interval seconds, see TealFlusher.
+                TealPrint messages and warnings/errors always flush directly
+        """
+        super().__init__()
+        self.batch_size = batch_size
+
+    @staticmethod
+    def to_teal_level(levelno: int) -> TealLevel:
+        """Map a logging level to a TealLevel. Levels between DEBUG and INFO are verbose"""
+        if levelno >= logging.ERROR:
+            return TealLevel.error
+        if levelno >= logging.WARNING:
+            return TealLevel.warning
+        if levelno >= logging.INFO:
+            return TealLevel.info
+        if levelno > logging.DEBUG:
+            return TealLevel.verbose
+        return TealLevel.debug
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Checked before the filters and formatting, so that hidden records are cheap
+        if TealConfig.level.value < TealLoggingHandler.to_teal_level(record.levelno).value:
+            return False
+        return super().handle(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(_forwarding, "active", False):
+            return
+
+        level = TealLoggingHandler.to_teal_level(record.levelno)
+        color = ""
+        if level == TealLevel.error:
+            color = TealConfig.colors_default.error
+        elif level == TealLevel.warning:
+            color = TealConfig.colors_default.warning
+
+        # Formatted now, since formatting errors are reported by handleError() and the arguments can still change.
+        # Hidden levels have already been skipped by handle()
+        try:
+            message = self.format(record)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+
+        # Rate limit per callsite of the logging call
+        key = f"{record.pathname}:{record.lineno}" if TealConfig.rate_limit > 0 else None
+        buffer = TealPrint._get_buffer()
+        buffer._add_to_buffer_on_level(message, False, False, color, level, key=key)
+
+        if level.value <= TealLevel.warning.value or len(buffer.buffer) >= self.batch_size:
+            buffer.flush()
+        else:
+            # Also flushes buffers of threads that don't log again, and before the program exits
+            TealFlusher.flush_later(buffer)
+
+    def flush(self) -> None:
+        """Flush the buffer of the current thread"""
+        TealPrint._get_buffer().flush()
+
+
+class TealLoggingSink(TealSink):
+    """Forwards TealPrint messages to a logger of the logging module, e.g. to reuse its handlers.
+    The indentation is kept, and colors are removed.
+    """
+
+    # Map TealLevel.value to logging levels
+    levels: List[int] = [logging.NOTSET, logging.ERROR, logging.WARNING, logging.INFO, 15, logging.DEBUG]
+
+    def __init__(
+        self,
+        logger: Union[logging.Logger, str, None] = None,
+        level: TealLevel = TealLevel.debug,
+        renderer: Optional[TealRenderer] = None,
+    ) -> None:
+        """
+        Args:
+            logger (Union[logging.Logger, str, None]): The logger or name of the logger to forward to,
+                defaults to the root logger
+            level (TealLevel): Highest level that is forwarded
+            renderer (Optional[TealRenderer]): How the messages are rendered,
+                defaults to the console format of the current TealConfig
+        """
+        super().__init__(level, renderer)
+        self.logger = logger if isinstance(logger, logging.Logger) else logging.getLogger(logger)
+
+    def write(self, records: List[TealRecord]) -> None:
+        # Loggers don't get colors, so they aren't added in the first place
+        renderer = self.renderer or TealRenderer.get(colors=False)
+        _forwarding.active = True
+        try:
+            for record in records:
+                if record.level.value > self.level.value:
+                    continue
+                levelno = TealLoggingSink.levels[record.level.value]
+                # Skip rendering messages that the logger would discard
+                if not self.logger.isEnabledFor(levelno):
+                    continue
+                message = TealRenderer.remove_colors(renderer.render_record(record))
+                self.logger.log(levelno, "%s", message)
+        finally:
+            _forwarding.active = False
@@ -0,0 +1,157 @@
+import logging
+import time
+from threading import Thread
+from typing import List
+
+import pytest
+
+from . import TealConfig, TealLevel, TealLoggingHandler, TealLoggingSink, TealPrint
+
+
+class Collect(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("tealprint_test")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    TealConfig.colors_enabled = False
+    yield logger
+    logger.handlers.clear()
+    TealConfig.reset()
+
+
+@pytest.mark.parametrize(
+    "name,levelno,expected",
+    [
+        ("Critical", logging.CRITICAL, TealLevel.error),
+        ("Error", logging.ERROR, TealLevel.error),
+        ("Warning", logging.WARNING, TealLevel.warning),
+        ("Info", logging.INFO, TealLevel.info),
+        ("Between debug and info", 15, TealLevel.verbose),
+        ("Debug", logging.DEBUG, TealLevel.debug),
+        ("Not set", logging.NOTSET, TealLevel.debug),
+    ],
+)
+def test_to_teal_level(name: str, levelno: int, expected: TealLevel) -> None:
+    print(name)
+    assert expected == TealLoggingHandler.to_teal_level(levelno)
+
+
+def test_handler_prints_with_indentation(logger, capsys) -> None:
+    logger.addHandler(TealLoggingHandler(batch_size=1))
+
+    TealPrint.info("Header", push_indent=True)
+    logger.info("From %s", "logging")
+    TealPrint.pop_indent()
+
+    assert "Header\n    From logging\n" == capsys.readouterr().out
+
+
+def test_handler_flushes_in_batches(logger, capsys) -> None:
+    TealConfig.flush_interval = 60
+    handler = TealLoggingHandler(batch_size=3)
+    logger.addHandler(handler)
+
+    logger.info("1")
+    logger.info("2")
+    assert "" == capsys.readouterr().out
+
+    logger.info("3")
+    assert "1\n2\n3\n" == capsys.readouterr().out
+
+    logger.info("4")
+    handler.flush()
+    assert "4\n" == capsys.readouterr().out
+
+
+def test_handler_flushes_warnings_directly(logger, capsys) -> None:
+    TealConfig.flush_interval = 60
+    logger.addHandler(TealLoggingHandler())
+
+    logger.info("Info")
+    logger.warning("Warning")
+
+    assert "Info\nWarning\n" == capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "name,in_thread",
+    [
+        ("Main thread", False),
+        ("Thread that doesn't log again", True),
+    ],
+)
+def test_handler_flushes_after_interval(logger, capsys, name: str, in_thread: bool) -> None:
+    print(name)
+    capsys.readouterr()
+    TealConfig.flush_interval = 0.05
+    logger.addHandler(TealLoggingHandler())
+
+    if in_thread:
+        thread = Thread(target=lambda: logger.info("Waiting"))
+        thread.start()
+        thread.join()
+    else:
+        logger.info("Waiting")
+    time.sleep(0.5)
+
+    assert "Waiting\n" == capsys.readouterr().out
+
+
+def test_handler_reports_formatting_errors(capsys, monkeypatch) -> None:
+    monkeypatch.setattr(logging, "raiseExceptions", True)
+    handler = TealLoggingHandler()
+
+    # Handled directly, since pytest's own logging handler would raise the error
+    handler.handle(logging.makeLogRecord({"msg": "bad %d", "args": ("x",), "levelno": logging.INFO}))
+    TealPrint.info("my own message")
+
+    captured = capsys.readouterr()
+    assert "my own message\n" == captured.out
+    assert "TypeError" in captured.err
+
+
+def test_handler_skips_hidden_levels_before_formatting(logger, capsys) -> None:
+    class FailingFormatter(logging.Formatter):
+        def format(self, record: logging.LogRecord) -> str:
+            raise AssertionError("Hidden records shouldn't be formatted")
+
+    handler = TealLoggingHandler(batch_size=1)
+    handler.setFormatter(FailingFormatter())
+    logger.addHandler(handler)
+
+    logger.debug("Hidden")
+    logger.log(15, "Hidden")
+
+    assert "" == capsys.readouterr().out
+
+
+def test_sink_forwards_to_logger(logger) -> None:
+    collect = Collect()
+    logger.addHandler(collect)
+    TealConfig.level = TealLevel.debug
+    TealConfig.sinks = [TealLoggingSink(logger)]
+
+    TealPrint.warning("Header", push_indent=True)
+    TealPrint.verbose("Details")
+    TealPrint.pop_indent()
+
+    assert [(logging.WARNING, "Header"), (15, "    Details")] == [(r.levelno, r.getMessage()) for r in collect.records]
+
+
+def test_sink_and_handler_on_same_logger_dont_loop(logger, capsys) -> None:
+    logger.addHandler(TealLoggingHandler(batch_size=1))
+    TealConfig.sinks = [TealLoggingSink(logger)]
+
+    TealPrint.info("Once")
+    logger.info("From logging")
+
+    assert "" == capsys.readouterr().out
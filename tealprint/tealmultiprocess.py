@@ -0,0 +1,92 @@
+from threading import Thread
+from typing import Any, List, Optional
+
+from .tealconfig import TealConfig
+from .tealprintbuffer import TealPrintBuffer
+from .tealrecord import TealRecord
+from .tealsink import TealSink
+
+
+class TealQueueSink(TealSink):
+    """Sends records from a worker process to a TealCollector in the parent process.
+    The records of each flush are sent as one batch, directly, so nothing is left in the worker when it's terminated,
+    e.g. when leaving a `with Pool(...)` block. Use TealConfig.flush_level to batch messages in the worker, and call
+    TealPrint.flush() at the end of a task, since batched messages are lost when the worker is terminated.
+    """
+
+    def __init__(self, queue: Any, worker: str) -> None:
+        """
+        Args:
+            queue (multiprocessing.SimpleQueue): TealCollector.queue
+            worker (str): Name of the worker, printed before its messages
+        """
+        super().__init__()
+        self.queue = queue
+        self.worker = worker
+
+    def write(self, records: List[TealRecord]) -> None:
+        for record in records:
+            # Functions and arguments can't always be pickled, so format the message before sending it
+            record.get_message()
+            record.worker = self.worker
+        # Written to the pipe before returning, unlike multiprocessing.Queue which sends from a thread of the worker
+        self.queue.put(records)
+
+
+class TealCollector:
+    """Collects messages from worker processes and writes them from the parent process.
+    Workers send their records in batches over a queue, and the collector writes them to TealConfig.sinks of the
+    parent process, with the indentation they had in the worker and the name of the worker before each message.
+
+    Example:
+        with TealCollector() as collector:
+            with Pool(8, initializer=TealCollector.connect, initargs=(collector.queue,)) as pool:
+                pool.map(work, items)
+    """
+
+    def __init__(self, context: Any = None) -> None:
+        """
+        Args:
+            context (multiprocessing.context.BaseContext): Context to create the queue with,
+                defaults to the default multiprocessing context
+        """
+        if context is None:
+            import multiprocessing as context
+
+        self.queue = context.SimpleQueue()
+        self._thread = Thread(target=self._run, name="tealprint-collector", daemon=True)
+
+    def __enter__(self) -> "TealCollector":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write all records that have been sent, and stop the collector"""
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            records = self.queue.get()
+            if records is None:
+                return
+            TealPrintBuffer._write(records)
+
+    @staticmethod
+    def connect(queue: Any, worker: Optional[str] = None) -> None:
+        """Call in a worker process to send all its messages to the collector, e.g. as the initializer of a Pool
+
+        Args:
+            queue (multiprocessing.SimpleQueue): TealCollector.queue
+            worker (Optional[str]): Name of the worker, defaults to the name of the process
+        """
+        import multiprocessing
+
+        name = worker or multiprocessing.current_process().name
+        TealConfig.sinks = [TealQueueSink(queue, name)]
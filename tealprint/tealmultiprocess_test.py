@@ -0,0 +1,45 @@
+from multiprocessing import Pool
+
+from . import TealCollector, TealConfig, TealLevel, TealPrint
+
+indent = "".ljust(TealConfig.indent_by, TealConfig.indent_char)
+
+
+def work(number: int) -> None:
+    TealPrint.info(f"Job {number}", push_indent=True)
+    TealPrint.info("Step")
+    TealPrint.pop_indent()
+
+
+def test_collects_messages_from_workers(capsys) -> None:
+    TealConfig.level = TealLevel.info
+
+    with TealCollector() as collector:
+        with Pool(2, initializer=TealCollector.connect, initargs=(collector.queue,)) as pool:
+            pool.map(work, range(4))
+            pool.close()
+            pool.join()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert 8 == len(lines)
+    for number in range(4):
+        job = [line for line in lines if line.endswith(f"] Job {number}")]
+        assert 1 == len(job)
+        worker = job[0].split(" ")[0]
+        # Indentation is kept, and the step comes after its job from the same worker
+        after_job = lines[lines.index(job[0]) + 1 :]  # noqa: E203
+        assert f"{worker} {indent}Step" in after_job
+
+
+def test_collects_all_messages_when_pool_is_terminated(capsys) -> None:
+    TealConfig.level = TealLevel.info
+
+    # Leaving the with block terminates the workers, without waiting for them to exit
+    with TealCollector() as collector:
+        with Pool(4, initializer=TealCollector.connect, initargs=(collector.queue,)) as pool:
+            pool.map(work, range(20))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert 40 == len(lines)
+    for number in range(20):
+        assert 1 == len([line for line in lines if line.endswith(f"] Job {number}")])
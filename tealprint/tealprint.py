@@ -1,34 +1,60 @@
+import sys
+from contextvars import ContextVar
+from itertools import islice
+from threading import get_ident
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .tealbackpressure import TealBackpressure
 from .tealconfig import TealConfig
+from .tealflightrecorder import TealFlightRecorder
+from .tealflusher import TealFlusher
 from .teallevel import TealLevel
 from .tealprintbuffer import TealPrintBuffer
+from .tealratelimiter import TealRateLimiter
+from .tealrecord import TealMessage, TealRecord
+from .tealstats import TealStats
+from .tealstatus import TealStatus
+from .tealtable import TealTable
+from .tealwriter import TealWriter
 
+# The buffer of the current thread or asyncio task, paired with the thread/task that owns it
+_buffer_var: ContextVar[Optional[Tuple[Any, TealPrintBuffer]]] = ContextVar("tealprint_buffer", default=None)
 
-class TealPrint:
-    _buffer = TealPrintBuffer()
 
+class TealPrint:
     @staticmethod
     def error(
-        message: str,
+        message: TealMessage,
         push_indent: bool = False,
         pop_indent: bool = False,
         color: str = TealConfig.colors_default.error,
         exit: bool = False,
         print_exception: bool = False,
         print_report_this: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
     ):
         """Recommendation: Only use this when an error occurs and you have to exit the program
            Prints an error message in red, can quit and print an exception.
            Also prints a "Please report this and paste the above message"
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             exit (bool): If the program should exit after printing the error
-            print_exception (bool): Set to true to print an exception
+            print_exception (bool): Set to true to print the exception that is being handled.
+                Repeated exceptions only print their traceback once, see TealConfig.exception_dedupe
             print_report_this (bool): Set to true to add an "Please report this..." message at the end
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
         """
-        TealPrint._buffer.error(
+        if TealConfig.level.value < TealLevel.error.value and not exit:
+            TealPrint._skip(TealLevel.error, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.error(
             message,
             push_indent,
             pop_indent,
@@ -36,71 +62,420 @@ class TealPrint:
             exit,
             print_exception,
             print_report_this,
+            args,
+            TealRateLimiter.callsite(key, 1),
         )
-        TealPrint._buffer.flush()
+        if TealLevel.error.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
 
     @staticmethod
     def warning(
-        message: str,
+        message: TealMessage,
         push_indent: bool = False,
         pop_indent: bool = False,
         color: str = TealConfig.colors_default.warning,
         exit: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
     ):
         """Prints an orange warning message message
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             exit (bool): If the program should exit after printing the warning
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
         """
-        TealPrint._buffer.warning(message, push_indent, pop_indent, color, exit)
-        TealPrint._buffer.flush()
+        if TealConfig.level.value < TealLevel.warning.value:
+            TealPrint._skip(TealLevel.warning, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.warning(message, push_indent, pop_indent, color, exit, args, TealRateLimiter.callsite(key, 1))
+        if TealLevel.warning.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
 
     @staticmethod
-    def info(message: str, push_indent: bool = False, pop_indent: bool = False, color: str = ""):
+    def info(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ):
         """Print a message if TealPrint.level has been set to debug/verbose/info
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
         """
-        TealPrint._buffer.info(message, push_indent, pop_indent, color)
-        TealPrint._buffer.flush()
+        if TealConfig.level.value < TealLevel.info.value:
+            TealPrint._skip(TealLevel.info, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.info(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        if TealLevel.info.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
 
     @staticmethod
-    def verbose(message: str, push_indent: bool = False, pop_indent: bool = False, color: str = ""):
+    def verbose(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ):
         """Prints a message if TealPrint.level has been set to debug/verbose
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
         """
-        TealPrint._buffer.verbose(message, push_indent, pop_indent, color)
-        TealPrint._buffer.flush()
+        if TealConfig.level.value < TealLevel.verbose.value:
+            TealPrint._skip(TealLevel.verbose, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.verbose(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        if TealLevel.verbose.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
 
     @staticmethod
-    def debug(message: str, push_indent: bool = False, pop_indent: bool = False, color: str = ""):
+    def debug(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ):
         """Prints a message if the TealPrint.level has been set to debug
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+        """
+        if TealConfig.level.value < TealLevel.debug.value:
+            TealPrint._skip(TealLevel.debug, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.debug(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        if TealLevel.debug.value <= TealConfig.flush_level.value:
+            buffer.flush()
+        else:
+            TealFlusher.flush_later(buffer)
+
+    @staticmethod
+    async def aerror(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = TealConfig.colors_default.error,
+        exit: bool = False,
+        print_exception: bool = False,
+        print_report_this: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Like error(), but doesn't block the event loop while writing. Messages of a task are written in order
+        and with the indentation of the task. See TealPrintBuffer.aflush()
+        """
+        if TealConfig.level.value < TealLevel.error.value and not exit:
+            TealPrint._skip(TealLevel.error, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.error(
+            message,
+            push_indent,
+            pop_indent,
+            color,
+            exit,
+            print_exception,
+            print_report_this,
+            args,
+            TealRateLimiter.callsite(key, 1),
+        )
+        await buffer.aflush()
+
+    @staticmethod
+    async def awarning(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = TealConfig.colors_default.warning,
+        exit: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Like warning(), but doesn't block the event loop while writing, see aerror()"""
+        if TealConfig.level.value < TealLevel.warning.value:
+            TealPrint._skip(TealLevel.warning, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.warning(message, push_indent, pop_indent, color, exit, args, TealRateLimiter.callsite(key, 1))
+        await buffer.aflush()
+
+    @staticmethod
+    async def ainfo(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Like info(), but doesn't block the event loop while writing, see aerror()"""
+        if TealConfig.level.value < TealLevel.info.value:
+            TealPrint._skip(TealLevel.info, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.info(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        await buffer.aflush()
+
+    @staticmethod
+    async def averbose(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Like verbose(), but doesn't block the event loop while writing, see aerror()"""
+        if TealConfig.level.value < TealLevel.verbose.value:
+            TealPrint._skip(TealLevel.verbose, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.verbose(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        await buffer.aflush()
+
+    @staticmethod
+    async def adebug(
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+    ) -> None:
+        """Like debug(), but doesn't block the event loop while writing, see aerror()"""
+        if TealConfig.level.value < TealLevel.debug.value:
+            TealPrint._skip(TealLevel.debug, push_indent, pop_indent, message, args, color)
+            return
+
+        buffer = TealPrint._get_buffer()
+        buffer.debug(message, push_indent, pop_indent, color, args, TealRateLimiter.callsite(key, 1))
+        await buffer.aflush()
+
+    @staticmethod
+    async def aflush() -> None:
+        """Write the messages of the current task that have been batched because of TealConfig.flush_level,
+        without blocking the event loop
+        """
+        await TealPrint._get_buffer().aflush()
+
+    @staticmethod
+    def channel(name: str) -> "TealChannel":
+        """Get the channel with the name, for messages of a subsystem with its own level.
+        Names are dotted, and a channel without a level uses the level of the channel above it, e.g. "db" for
+        "db.pool", or TealConfig.level. Checking if a message is hidden costs the same as for TealPrint.
+
+        For example:
+            pool = TealPrint.channel("db.pool")
+            TealPrint.channel("db").level = TealLevel.debug
+            pool.debug("Shown, even though TealConfig.level is info")
+
+        Args:
+            name (str): Dotted name of the channel
+        """
+        return TealChannel.get(name)
+
+    @staticmethod
+    def section(header: str, level: TealLevel = TealLevel.info) -> "TealSection":
+        """Prints the header and indents all messages until the section ends. When it ends, the wall time and the
+        CPU time of the current thread in the section is printed. The outermost section also prints a summary tree
+        of the time of the sections inside it. Indentation pushed inside the section is always removed, also when an
+        exception is raised.
+
+        For example:
+            with TealPrint.section("Building"):
+                TealPrint.info("Indented")
+
+            @TealPrint.section("Compiling", TealLevel.verbose)
+            def compile():
+                ...
+
+        Args:
+            header (str): Printed when the section starts, and used as the name of the section in the summary
+            level (TealLevel): Level of the header and the times. Nothing is timed if the level is hidden
+        """
+        return TealSection(header, level)
+
+    @staticmethod
+    def status(
+        message: TealMessage,
+        level: TealLevel = TealLevel.info,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+    ) -> None:
+        """Show a message in a status line that is updated in place, e.g. for progress.
+        Can be called as often as you like, the line is redrawn at most TealConfig.status_refresh_rate times per second
+        and updates in between are skipped. Messages printed while the status is shown are printed above it.
+        When stdout isn't a terminal, or colors or unicode are disabled, the latest status is instead printed as a
+        normal message every TealConfig.status_fallback_interval seconds.
+        Call end_status() to remove the status line.
+
+        Args:
+            message (TealMessage): The status to show, or a function returning it that is only called if it's drawn
+            level (TealLevel): Level of the status, nothing is shown if the level is hidden
+            color (str): Optional color of the status
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the status is drawn
         """
-        TealPrint._buffer.debug(message, push_indent, pop_indent, color)
-        TealPrint._buffer.flush()
+        if TealConfig.level.value < level.value:
+            return
+
+        record = TealRecord(level, message, args, color, TealPrint._get_buffer()._get_indent_level())
+        TealStatus.get().update(record)
+
+    @staticmethod
+    def end_status() -> None:
+        """Remove the status line, and skip updates that haven't been shown yet"""
+        status = TealStatus.active
+        if status is not None:
+            status.clear()
+
+    @staticmethod
+    def lines(
+        messages: Iterable[str], level: TealLevel = TealLevel.info, color: str = "", chunk_size: int = 1000
+    ) -> None:
+        """Print many messages at once, e.g. rows of a report. The messages are written in chunks of chunk_size,
+        so a generator is never completely in memory. The level, indentation and color are only looked up once per
+        chunk, and the messages aren't rate limited, collapsed or kept by the flight recorder.
+
+        Args:
+            messages (Iterable[str]): The messages, one line each. Not iterated if the level is hidden
+            level (TealLevel): Level of all messages
+            color (str): Optional color of all messages
+            chunk_size (int): Number of messages that are rendered and written together
+        """
+        if TealConfig.level.value < level.value:
+            return
+
+        buffer = TealPrint._get_buffer()
+        iterator = iter(messages)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if len(chunk) == 0:
+                break
+            buffer.lines(chunk, level, color)
+            buffer.flush()
+
+    @staticmethod
+    def table(
+        rows: Iterable[Sequence[Any]],
+        header: Optional[Sequence[Any]] = None,
+        level: TealLevel = TealLevel.info,
+        color: str = "",
+        chunk_size: int = 1000,
+    ) -> None:
+        """Print rows as a table with aligned columns. Numbers are aligned to the right, everything else to the left.
+        The rows are written in chunks of chunk_size, so a generator is never completely in memory.
+        The column widths are taken from the header and the first chunk, and grow if later rows are wider.
+
+        Args:
+            rows (Iterable[Sequence[Any]]): Rows of cells, any cell is converted with str(). Not iterated if the
+                level is hidden
+            header (Optional[Sequence[Any]]): Titles of the columns, underlined
+            level (TealLevel): Level of the table
+            color (str): Optional color of the table
+            chunk_size (int): Number of rows that are rendered and written together
+        """
+        if TealConfig.level.value < level.value:
+            return
+
+        table = TealTable(header)
+        buffer = TealPrint._get_buffer()
+        iterator = iter(rows)
+        # The first chunk is always formatted, to print the header of an empty table
+        chunk = list(islice(iterator, chunk_size))
+        while True:
+            buffer.lines(table.format(chunk), level, color)
+            buffer.flush()
+            chunk = list(islice(iterator, chunk_size))
+            if len(chunk) == 0:
+                break
+
+    @staticmethod
+    def is_enabled(level: TealLevel) -> bool:
+        """Check if messages of this level would be printed.
+        Useful to skip expensive work that's only needed for the message
+
+        Args:
+            level (TealLevel): The level to check
+        """
+        return TealConfig.level.value >= level.value
+
+    @staticmethod
+    def _skip(
+        level: TealLevel,
+        push_indent: bool,
+        pop_indent: bool,
+        message: TealMessage,
+        args: Tuple[Any, ...],
+        color: str,
+    ) -> None:
+        """Skip a message that wouldn't be shown, but still push/pop the indentation.
+        Also keeps the message if the flight recorder is enabled
+        """
+        if TealStats.active is not None:
+            TealStats.active.add_suppressed(level)
+
+        recorder = TealFlightRecorder.active
+        if recorder is None and not push_indent and not pop_indent:
+            return
+
+        buffer = TealPrint._get_buffer()
+        if recorder is not None:
+            recorder.record(TealRecord(level, message, args, color, len(buffer.indent_stack)))
+        if push_indent:
+            buffer.push_indent(level)
+        if pop_indent:
+            buffer.pop_indent()
 
     @staticmethod
     def push_indent(level: TealLevel) -> None:
         """Add indentation for all messages, but only if level is would be shown"""
-        TealPrint._buffer.push_indent(level)
+        TealPrint._get_buffer().push_indent(level)
 
     @staticmethod
     def pop_indent() -> None:
@@ -119,7 +494,7 @@ class TealPrint:
             TealPrint.pop_indent()
             TealPrint.info("Not indentend")
         """
-        TealPrint._buffer.pop_indent()
+        TealPrint._get_buffer().pop_indent()
 
     @staticmethod
     def clear_indent() -> None:
@@ -127,4 +502,139 @@ class TealPrint:
         Removes all indentation. Note that calling pop() will throw an exception now.
         Recommended to use before exiting the app or returning from an excetpion.
         """
-        TealPrint._buffer.clear_indent()
+        TealPrint._get_buffer().clear_indent()
+
+    @staticmethod
+    def _get_buffer() -> TealPrintBuffer:
+        """Get the buffer of the current thread or asyncio task, creating it if needed.
+        A new asyncio task starts with the indentation of the task that created it.
+        """
+        owner = TealPrint._get_owner()
+        entry = _buffer_var.get()
+        if entry is not None and entry[0] == owner:
+            return entry[1]
+
+        buffer = TealPrintBuffer()
+        buffer.on_repeat = TealFlusher.flush_repeated_later
+        if entry is not None:
+            buffer.indent_stack = list(entry[1].indent_stack)
+        _buffer_var.set((owner, buffer))
+        return buffer
+
+    @staticmethod
+    def _get_owner() -> Any:
+        """Returns the current asyncio task, or the current thread id when not running in a task"""
+        # Only look for a task if asyncio has been imported, otherwise there can't be one
+        asyncio = sys.modules.get("asyncio")
+        if asyncio is not None:
+            loop = asyncio._get_running_loop()
+            if loop is not None:
+                task = asyncio.current_task(loop)
+                if task is not None:
+                    return task
+        return get_ident()
+
+    @staticmethod
+    def enable_async(max_queue_size: int = 10000, backpressure: TealBackpressure = TealBackpressure.block) -> None:
+        """
+        Write messages on a background thread instead of on the calling thread.
+        Messages are written in batches, i.e. one write for all messages that were queued since the last write.
+        Everything that has been queued is always written before the program exits,
+        either through exit=True, sys.exit() or when the interpreter shuts down.
+
+        Args:
+            max_queue_size (int): Maximum number of flushes waiting to be written
+            backpressure (TealBackpressure): What to do when the queue is full.
+                block waits for the writer, drop_oldest/drop_newest discards messages
+        """
+        TealPrint.disable_async()
+        writer = TealWriter(TealPrintBuffer._write_batch, max_queue_size, backpressure)
+        writer.start()
+        TealWriter.active = writer
+
+    @staticmethod
+    def disable_async() -> None:
+        """Write all queued messages and go back to writing messages on the calling thread"""
+        TealWriter._stop_active()
+
+    @staticmethod
+    def enable_flight_recorder(capacity: int = 1000, level: TealLevel = TealLevel.debug) -> None:
+        """
+        Keep the latest hidden messages in memory, e.g. debug messages when TealConfig.level is info.
+        They are printed before the next error, when exiting through exit=True or when calling dump_flight_recorder().
+        Messages are only formatted if they're printed, so keeping them is cheap.
+
+        Args:
+            capacity (int): Maximum number of messages to keep, the oldest messages are discarded first
+            level (TealLevel): Highest level of hidden messages to keep
+        """
+        TealFlightRecorder.active = TealFlightRecorder(capacity, level)
+
+    @staticmethod
+    def disable_flight_recorder() -> None:
+        """Stop keeping hidden messages, and discard the ones that have been kept"""
+        TealFlightRecorder.active = None
+
+    @staticmethod
+    def dump_flight_recorder() -> None:
+        """Print the hidden messages kept by the flight recorder"""
+        buffer = TealPrint._get_buffer()
+        buffer.dump_flight_recorder()
+        buffer.flush()
+
+    @staticmethod
+    def enable_stats() -> None:
+        """
+        Count messages, bytes, flushes and the time spent writing them. Read them with get_stats().
+        When stats are disabled, they cost a single check per message.
+        """
+        TealStats.active = TealStats()
+
+    @staticmethod
+    def disable_stats() -> None:
+        """Stop counting and discard the stats"""
+        TealStats.active = None
+
+    @staticmethod
+    def get_stats() -> Optional[Dict[str, Any]]:
+        """Returns a snapshot of the stats, or None if stats aren't enabled.
+
+        Returns:
+            emitted/suppressed: Messages per level that were printed, or hidden by the level, rate limited or collapsed
+            chars_rendered: Characters rendered for all sinks
+            bytes_written: Bytes written to streams and files
+            flushes: Number of flushes that had messages
+            lock_wait_seconds: Time spent waiting for other threads to finish writing
+            flush_latency: Histogram of the time it took to write a flush to all sinks
+        """
+        stats = TealStats.active
+        if stats is None:
+            return None
+        return stats.snapshot()
+
+    @staticmethod
+    def reset_stats() -> None:
+        """Set all stats to 0"""
+        stats = TealStats.active
+        if stats is not None:
+            stats.reset()
+
+    @staticmethod
+    def flush() -> None:
+        """Write messages that have been batched because of TealConfig.flush_level, in all threads.
+        Also prints how many times the last message has been repeated, see TealConfig.collapse_repeated
+        """
+        TealPrint._get_buffer().flush_repeated()
+        TealFlusher.flush_all()
+
+    @staticmethod
+    def drain() -> None:
+        """Wait until the background writer has written all queued messages. Does nothing if async is disabled"""
+        writer = TealWriter.active
+        if writer:
+            writer.drain()
+
+
+# Channels and sections print through TealPrint, so they can only be imported once it exists
+from .tealchannel import TealChannel  # noqa: E402
+from .tealsection import TealSection  # noqa: E402
@@ -1,9 +1,15 @@
 from __future__ import print_function
 
+import asyncio
+import os
+import subprocess
+import sys
+from threading import Event, Thread
+
 import pytest
-from mockito import spy2, unstub, verify, verifyZeroInteractions
+from mockito import spy2, unstub, verify, verifyZeroInteractions, when
 
-from . import TealConfig, TealLevel, TealPrint
+from . import TealConfig, TealLevel, TealPrint, TealPrintBuffer
 
 
 @pytest.mark.parametrize(
@@ -83,13 +89,165 @@ def test_print_level(name: str, level: TealLevel, function_tuple):
     TealConfig.level = level
 
     for function, expected in function_tuple:
-        spy2(TealPrint._buffer._add_to_buffer)
+        spy2(TealPrint._get_buffer()._add_to_buffer)
 
         function("message")
 
         if expected:
-            verify(TealPrint._buffer, atleast=1)._add_to_buffer(...)
+            verify(TealPrint._get_buffer(), atleast=1)._add_to_buffer(...)
         else:
             verifyZeroInteractions()
 
         unstub()
+
+
+def test_threads_have_their_own_indentation(capsys) -> None:
+    TealConfig.level = TealLevel.info
+    pushed = Event()
+    printed = Event()
+
+    def indenting_thread():
+        TealPrint.push_indent(TealLevel.info)
+        pushed.set()
+        printed.wait()
+        TealPrint.pop_indent()
+
+    thread = Thread(target=indenting_thread)
+    thread.start()
+    pushed.wait()
+    TealPrint.info("Not indented")
+    printed.set()
+    thread.join()
+
+    assert "Not indented\n" == capsys.readouterr().out
+
+
+def test_asyncio_tasks_have_their_own_indentation(capsys) -> None:
+    TealConfig.level = TealLevel.info
+    indent = "".ljust(TealConfig.indent_by, TealConfig.indent_char)
+
+    async def task(name: str):
+        TealPrint.info(name, push_indent=True)
+        await asyncio.sleep(0)
+        TealPrint.info(name)
+        TealPrint.pop_indent()
+
+    async def main():
+        TealPrint.info("Header", push_indent=True)
+        await asyncio.gather(task("a"), task("b"))
+        TealPrint.pop_indent()
+
+    asyncio.run(main())
+
+    expected = f"Header\n{indent}a\n{indent}b\n{indent}{indent}a\n{indent}{indent}b\n"
+    assert expected == capsys.readouterr().out
+
+
+def test_lazy_message_only_created_when_shown(capsys) -> None:
+    TealConfig.level = TealLevel.info
+    calls = []
+
+    def message() -> str:
+        calls.append(1)
+        return "Lazy"
+
+    TealPrint.debug(message)
+    assert [] == calls
+
+    TealPrint.info(message)
+    assert [1] == calls
+    assert "Lazy\n" == capsys.readouterr().out
+
+
+def test_format_args(capsys) -> None:
+    TealConfig.level = TealLevel.info
+
+    TealPrint.info("%s took %d ms", args=("Saving", 12))
+
+    assert "Saving took 12 ms\n" == capsys.readouterr().out
+
+
+def test_format_args_when_printed_with_async(capsys) -> None:
+    TealConfig.level = TealLevel.info
+    items = []
+
+    TealPrint.enable_async()
+    for i in range(3):
+        items.append(i)
+        TealPrint.info("%s", args=(items,))
+    TealPrint.disable_async()
+
+    assert "[0]\n[0, 1]\n[0, 1, 2]\n" == capsys.readouterr().out
+
+
+def test_message_that_fails_to_format_does_not_drop_others(capsys) -> None:
+    TealConfig.level = TealLevel.info
+
+    TealPrint.enable_async()
+    TealPrint.info("before")
+    TealPrint.info(lambda: str(1 / 0))
+    TealPrint.info("after")
+    TealPrint.disable_async()
+
+    out = capsys.readouterr().out
+    assert out.startswith("before\n(tealprint couldn't format the message")
+    assert "ZeroDivisionError" in out
+    assert out.endswith("after\n")
+
+
+def test_disabled_level_does_not_write() -> None:
+    TealConfig.level = TealLevel.info
+    when(TealPrintBuffer)._write(...)
+
+    TealPrint.debug("Not shown")
+    TealPrint.verbose("Not shown either")
+
+    verify(TealPrintBuffer, times=0)._write(...)
+    unstub()
+
+
+def test_disabled_level_still_pushes_indent(capsys) -> None:
+    TealConfig.level = TealLevel.info
+    indent = "".ljust(TealConfig.indent_by, TealConfig.indent_char)
+
+    TealPrint.debug("Not shown", push_indent=True)
+    TealPrint.info("Shown", push_indent=True)
+    TealPrint.info("Indented")
+    TealPrint.pop_indent()
+    TealPrint.pop_indent()
+
+    assert f"Shown\n{indent}Indented\n" == capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "name,config_level,level,expected",
+    [
+        ("Enabled on same level", TealLevel.info, TealLevel.info, True),
+        ("Enabled on lower level", TealLevel.info, TealLevel.error, True),
+        ("Disabled on higher level", TealLevel.info, TealLevel.debug, False),
+        ("Everything disabled on none", TealLevel.none, TealLevel.error, False),
+    ],
+)
+def test_is_enabled(name: str, config_level: TealLevel, level: TealLevel, expected: bool) -> None:
+    print(name)
+
+    TealConfig.level = config_level
+
+    assert expected == TealPrint.is_enabled(level)
+
+    TealConfig.reset()
+
+
+def test_import_does_not_load_heavy_modules() -> None:
+    modules = ["colored", "traceback", "json", "multiprocessing", "asyncio", "logging"]
+    code = f"import sys, tealprint; print([m for m in {modules} if m in sys.modules])"
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert "[]\n" == result.stdout
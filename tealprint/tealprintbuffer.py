@@ -1,32 +1,70 @@
-import re
 import sys
-import traceback
-from io import StringIO
-from threading import Lock
-from typing import List
-
-from colored import attr
-
-from . import TealConfig, TealLevel
+from threading import Lock, get_ident
+from time import monotonic, perf_counter_ns, time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .tealconfig import TealConfig
+from .teallevel import TealLevel
+from .tealexception import TealException
+from .tealflightrecorder import TealFlightRecorder
+from .tealratelimiter import TealRateLimiter
+from .tealrecord import TealMessage, TealRecord
+from .tealrenderer import TealRenderer
+from .tealsampler import TealSampler
+from .tealstats import TealStats
+from .tealtable import TealTable
+from .tealwriter import TealWriter
+
+if TYPE_CHECKING:
+    from .tealchannel import TealChannel
+
+# Estimated characters of a message from a function, and of each %-format argument, see TealPrintBuffer.get_size()
+_estimated_lazy_size = 80
+_estimated_arg_size = 16
 
 
 class TealPrintBuffer:
-    _mutex = Lock()
     _ascii: bool = False
 
     def __init__(self) -> None:
-        self.buffer = StringIO()
+        self.buffer: List[TealRecord] = []
         self.indent_stack: List[TealLevel] = []
+        # Number of visible indentations, only valid for the TealConfig version it was calculated for
+        self._indent_level = 0
+        self._indent_version = -1
+        # The last message, and how many times it has been repeated, for TealConfig.collapse_repeated
+        self._repeat_key: Optional[Tuple[TealLevel, str, str, int]] = None
+        self._repeat_record: Optional[TealRecord] = None
+        self._repeated = 0
+        self._repeated_since = 0.0
+        # When the last message was last repeated
+        self.last_repeat = 0.0
+        # The count of repeats is also printed from TealFlusher's thread
+        self._repeat_lock = Lock()
+        # Called when the last message starts repeating, since no next message might come to print the count.
+        # TealPrint sets it for its own buffers, so that TealFlusher prints the count once the repeats stop
+        self.on_repeat: Optional[Callable[["TealPrintBuffer"], None]] = None
+        # When the first message that hasn't been flushed was added, 0 if everything has been flushed.
+        # Only tracked when TealPrint defers flushing, see TealConfig.flush_level
+        self.pending_since = 0.0
+        # Approximate size of the messages in the buffer, and how many of them have been measured
+        self._size = 0
+        self._measured = 0
+        # The buffer can be flushed from another thread, e.g. by TealFlusher
+        self._flush_lock = Lock()
 
     def error(
         self,
-        message: str,
+        message: TealMessage,
         push_indent: bool = False,
         pop_indent: bool = False,
         color: str = TealConfig.colors_default.error,
         exit: bool = False,
         print_exception: bool = False,
         print_report_this: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
     ) -> None:
         """Recommendation: Only use this when an error occurs and you have to exit the program.
            Add an error message in red to the buffer. Can print the exception.
@@ -35,86 +73,212 @@ class TealPrintBuffer:
            Call flush() to print the messages.
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message, defaults to TealConfig.colors_default.error
             exit (bool): If the program should exit after printing the error. Also flushes messages
-            print_exception (bool): Set to true to print an exception
+            print_exception (bool): Set to true to print the exception that is being handled.
+                Repeated exceptions only print their traceback once, see TealConfig.exception_dedupe
             print_report_this (bool): Set to true to add an "Please report this..." message at the end
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+            channel (Optional[TealChannel]): Channel of the message, which decides if it's shown instead of
+                TealConfig.level
         """
-        self._add_to_buffer_on_level(message, push_indent, pop_indent, color, TealLevel.error)
-        if print_exception:
-            exception = traceback.format_exc()
-            self._add_to_buffer_on_level(exception, False, False, color, TealLevel.error)
-        if print_report_this:
+        key = TealRateLimiter.callsite(key, 1)
+        shown = self._add_to_buffer_on_level(
+            message, push_indent, pop_indent, color, TealLevel.error, args=args, key=key, channel=channel
+        )
+        if print_exception and shown:
+            exception = TealException.get_message()
+            if exception is not None:
+                self._add_to_buffer_on_level(exception, False, False, color, TealLevel.error, channel=channel)
+        if print_report_this and shown:
             self._add_to_buffer_on_level(
-                "!!! Please report this and paste the above message !!!", False, False, color, TealLevel.error
+                "!!! Please report this and paste the above message !!!",
+                False,
+                False,
+                color,
+                TealLevel.error,
+                channel=channel,
             )
         if exit:
-            self.flush()
-            sys.exit(1)
+            self._flush_and_exit()
 
     def warning(
         self,
-        message: str,
+        message: TealMessage,
         push_indent: bool = False,
         pop_indent: bool = False,
         color: str = TealConfig.colors_default.warning,
         exit: bool = False,
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
     ) -> None:
         """Add an orange warning message to the buffer.
            If exit=True, it flushes all messages before exiting.
            Call flush() to print the messages.
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message, defaults to TealConfig.colors_default.warning
             exit (bool): If the program should exit after printing the warning. Also flushes messages
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+            channel (Optional[TealChannel]): Channel of the message, which decides if it's shown instead of
+                TealConfig.level
         """
-        self._add_to_buffer_on_level(message, push_indent, pop_indent, color, TealLevel.warning, exit)
+        key = TealRateLimiter.callsite(key, 1)
+        self._add_to_buffer_on_level(
+            message, push_indent, pop_indent, color, TealLevel.warning, exit, args, key, channel
+        )
 
-    def info(self, message: str, push_indent: bool = False, pop_indent: bool = False, color: str = "") -> None:
+    def info(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
+    ) -> None:
         """Add a message to the buffer if TealConfig.level has been set to debug/verbose/info.
            Call flush() to print the messages.
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+            channel (Optional[TealChannel]): Channel of the message, which decides if it's shown instead of
+                TealConfig.level
         """
-        self._add_to_buffer_on_level(message, push_indent, pop_indent, color, TealLevel.info)
+        key = TealRateLimiter.callsite(key, 1)
+        self._add_to_buffer_on_level(
+            message, push_indent, pop_indent, color, TealLevel.info, args=args, key=key, channel=channel
+        )
 
-    def verbose(self, message: str, push_indent: bool = False, pop_indent: bool = False, color: str = "") -> None:
+    def verbose(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
+    ) -> None:
         """Add a message to the buffer if TealConfig.level has been set to debug/verbose.
            Call flush() to print the messages.
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+            channel (Optional[TealChannel]): Channel of the message, which decides if it's shown instead of
+                TealConfig.level
         """
-        self._add_to_buffer_on_level(message, push_indent, pop_indent, color, TealLevel.verbose)
+        key = TealRateLimiter.callsite(key, 1)
+        self._add_to_buffer_on_level(
+            message, push_indent, pop_indent, color, TealLevel.verbose, args=args, key=key, channel=channel
+        )
 
-    def debug(self, message: str, push_indent: bool = False, pop_indent: bool = False, color: str = "") -> None:
+    def debug(
+        self,
+        message: TealMessage,
+        push_indent: bool = False,
+        pop_indent: bool = False,
+        color: str = "",
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
+    ) -> None:
         """Add a message to the buffer if the TealConfig.level has been set to debug.
            Call flush() to print the messages.
 
         Args:
-            message (str): The message to print
+            message (TealMessage): The message to print, or a function returning it that is only called if shown
             push_indent (bool): If messages after this should be indented by one level. Call pop_indent() to unindent
             pop_indent (bool): If messages after this should be unindented by one level. Call push_indent() to indent
             color (str): Optional color of the message
+            args (Tuple[Any, ...]): Arguments for a %-format message, only formatted if the message is shown
+            key (Optional[str]): Key for TealConfig.rate_limit, defaults to the file and line of the caller
+            channel (Optional[TealChannel]): Channel of the message, which decides if it's shown instead of
+                TealConfig.level
+        """
+        key = TealRateLimiter.callsite(key, 1)
+        self._add_to_buffer_on_level(
+            message, push_indent, pop_indent, color, TealLevel.debug, args=args, key=key, channel=channel
+        )
+
+    def lines(self, messages: Iterable[str], level: TealLevel = TealLevel.info, color: str = "") -> None:
+        """Add many messages at once. The level, indentation and color are only looked up once for all of them,
+        and the messages aren't rate limited, collapsed or kept by the flight recorder. They end repeats of the last
+        message for TealConfig.collapse_repeated.
+        Call flush() to print the messages.
+
+        Args:
+            messages (Iterable[str]): The messages, one line each. Not iterated if the level is hidden
+            level (TealLevel): Level of all messages
+            color (str): Optional color of all messages
+        """
+        if TealConfig.level.value < level.value:
+            return
+
+        # The lines end repeats of the last message, so its count comes before them
+        if self._repeat_key is not None:
+            self._add_repeated_summary()
+            self._repeat_key = None
+            self._repeat_record = None
+
+        indent_level = self._get_indent_level()
+        timestamp = time()
+        thread_id = get_ident()
+        count = len(self.buffer)
+        self.buffer.extend(
+            [TealRecord(level, message, (), color, indent_level, timestamp, thread_id) for message in messages]
+        )
+        if TealStats.active is not None:
+            TealStats.active.add_emitted(level, len(self.buffer) - count)
+        if TealConfig.buffer_max_size > 0:
+            self._flush_if_full()
+
+    def table(
+        self,
+        rows: Iterable[Sequence[Any]],
+        header: Optional[Sequence[Any]] = None,
+        level: TealLevel = TealLevel.info,
+        color: str = "",
+    ) -> None:
+        """Add rows as a table with aligned columns. Numbers are aligned to the right, everything else to the left.
+        Call flush() to print the table.
+
+        Args:
+            rows (Iterable[Sequence[Any]]): Rows of cells, any cell is converted with str(). Not iterated if the
+                level is hidden
+            header (Optional[Sequence[Any]]): Titles of the columns, underlined
+            level (TealLevel): Level of the table
+            color (str): Optional color of the table
         """
-        self._add_to_buffer_on_level(message, push_indent, pop_indent, color, TealLevel.debug)
+        if TealConfig.level.value < level.value:
+            return
+        self.lines(TealTable(header).format(list(rows)), level, color)
 
     def push_indent(self, level: TealLevel) -> None:
         """Add indentation for all messages, but only if level is would be shown"""
         self.indent_stack.append(level)
+        if self._indent_version == TealConfig._version and TealConfig.level.value >= level.value:
+            self._indent_level += 1
 
     def pop_indent(self) -> None:
         """
@@ -132,7 +296,9 @@ class TealPrintBuffer:
             TealPrint.pop_indent()
             TealPrint.info("Not indentend")
         """
-        self.indent_stack.pop()
+        level = self.indent_stack.pop()
+        if self._indent_version == TealConfig._version and TealConfig.level.value >= level.value:
+            self._indent_level -= 1
 
     def clear_indent(self) -> None:
         """
@@ -140,46 +306,58 @@ class TealPrintBuffer:
         Recommended to use before exiting the app or returning from an excetpion.
         """
         self.indent_stack.clear()
+        self._indent_level = 0
 
     def _add_to_buffer_on_level(
         self,
-        message: str,
+        message: TealMessage,
         push_indent: bool,
         pop_indent: bool,
         color: str,
         level: TealLevel,
         exit: bool = False,
-    ) -> None:
-        """Prints the message if the level is equal or lower to the specified"""
-        if TealConfig.level.value >= level.value:
-            try:
-                # Indent message
-                indent_level = self._get_indent_level()
-                if indent_level > 0:
-                    message = "".ljust(indent_level * TealConfig.indent_by, TealConfig.indent_char) + message
-                if len(color) > 0:
-                    message = f"{color}{message}{attr('reset')}"
-
-                # Remove colors if not supported
-                if not TealConfig.colors_enabled or not TealConfig.unicode_enabled:
-                    message = TealPrintBuffer._remove_colors_from_string(message)
-
-                # Convert to ascii if unicode is disabled or not supported
-                if not TealConfig.unicode_enabled:
-                    message = TealPrintBuffer._remove_unicode_from_string(message)
-                    message = message.encode("utf-8", "ignore").decode("ascii", "ignore")
-
-                self._add_to_buffer(message)
-
-                if exit:
-                    self.flush()
-                    sys.exit(1)
-
-            except UnicodeEncodeError:
-                # Some consoles can't use utf-8, encode into ascii instead, and use that
-                # in the future
-                TealConfig.unicode_enabled = False
-                self._add_to_buffer_on_level(message, False, False, color, level, exit)
+        args: Tuple[Any, ...] = (),
+        key: Optional[str] = None,
+        channel: Optional["TealChannel"] = None,
+    ) -> bool:
+        """Prints the message if the level is equal or lower to the specified
+
+        Returns:
+            bool: True if the message was added, False if it was hidden, sampled out, rate limited or collapsed
+        """
+        shown = False
+        shown_level = TealConfig.level if channel is None else channel.get_level()
+        if shown_level.value >= level.value and not self._is_sampled_out(level, color, key, channel):
+            # Show what happened before the error
+            if level == TealLevel.error or exit:
+                self.dump_flight_recorder()
+
+            record = TealRecord(level, message, args, color, self._get_indent_level())
+            if channel is not None:
+                record.channel = channel.name
+            if exit:
+                self._add_repeated_summary()
+                shown = True
+            else:
+                shown = self._allow(record, key)
+            if shown:
+                self._add_to_buffer(record)
+
+            stats = TealStats.active
+            if stats is not None:
+                if shown:
+                    stats.add_emitted(level)
+                else:
+                    stats.add_suppressed(level)
+
+            if exit:
+                self._flush_and_exit()
+
+        else:
+            if TealFlightRecorder.active is not None:
+                TealFlightRecorder.active.record(TealRecord(level, message, args, color, len(self.indent_stack)))
+            if TealStats.active is not None:
+                TealStats.active.add_suppressed(level)
 
         # Always push indent
         if push_indent:
@@ -188,36 +366,254 @@ class TealPrintBuffer:
         if pop_indent:
             self.pop_indent()
 
+        return shown
+
+    def _is_sampled_out(
+        self, level: TealLevel, color: str, key: Optional[str], channel: Optional["TealChannel"]
+    ) -> bool:
+        """Check if a debug or verbose message is skipped by TealConfig.sample_every or TealConfig.sample_rate.
+        Checked before the message is formatted. Adds how many messages were skipped when it's time to report it
+        """
+        if level.value < TealLevel.verbose.value or key is None:
+            return False
+        if TealConfig.sample_every <= 1 and TealConfig.sample_rate <= 0:
+            return False
+
+        skipped = TealSampler.get().sample(key)
+        if skipped < 0:
+            return True
+        if skipped > 0:
+            self._add_to_buffer(
+                TealRecord(
+                    level,
+                    "(%d messages were skipped by sampling)",
+                    (skipped,),
+                    color,
+                    self._get_indent_level(),
+                    channel=None if channel is None else channel.name,
+                )
+            )
+        return False
+
+    def _allow(self, record: TealRecord, key: Optional[str]) -> bool:
+        """Check if the record should be added, i.e. it's not rate limited or a repeat of the last message"""
+        if TealConfig.rate_limit > 0 and key is not None:
+            suppressed = TealRateLimiter.get().allow(key)
+            if suppressed < 0:
+                return False
+            if suppressed > 0:
+                self._add_to_buffer(
+                    TealRecord(
+                        record.level,
+                        "(%d similar messages were suppressed)",
+                        (suppressed,),
+                        record.color,
+                        record.indent_level,
+                        channel=record.channel,
+                    )
+                )
+
+        if TealConfig.collapse_repeated:
+            repeat_key = (record.level, record.get_message(), record.color, record.indent_level)
+            if repeat_key == self._repeat_key:
+                now = monotonic()
+                with self._repeat_lock:
+                    self._repeated += 1
+                    self.last_repeat = now
+                    repeated = self._repeated
+                    summary_due = now - self._repeated_since >= TealConfig.collapse_summary_interval
+                if summary_due:
+                    self._add_repeated_summary()
+                elif repeated == 1 and self.on_repeat is not None:
+                    self.on_repeat(self)
+                return False
+
+            self._add_repeated_summary()
+            self._repeat_key = repeat_key
+            self._repeat_record = record
+
+        return True
+
+    def _add_repeated_summary(self) -> None:
+        """Add a "repeated N times" message if the last message has been repeated since it was printed"""
+        with self._repeat_lock:
+            repeated = self._repeated
+            last = self._repeat_record
+            self._repeated = 0
+            self._repeated_since = monotonic()
+
+        if repeated > 0 and last is not None:
+            self._add_to_buffer(
+                TealRecord(
+                    last.level,
+                    "(repeated 1 more time)" if repeated == 1 else "(repeated %d more times)",
+                    () if repeated == 1 else (repeated,),
+                    last.color,
+                    last.indent_level,
+                    channel=last.channel,
+                )
+            )
+
     def _get_indent_level(self) -> int:
-        count = 0
-        for level in self.indent_stack:
-            if TealConfig.level.value >= level.value:
-                count += 1
-        return count
+        """Number of visible indentations. Only recounted when TealConfig has changed"""
+        if self._indent_version != TealConfig._version:
+            count = 0
+            for level in self.indent_stack:
+                if TealConfig.level.value >= level.value:
+                    count += 1
+            self._indent_level = count
+            self._indent_version = TealConfig._version
+        return self._indent_level
+
+    def _add_to_buffer(self, record: TealRecord) -> None:
+        """Append the record, and flush early if the buffer has reached TealConfig.buffer_max_size"""
+        self.buffer.append(record)
+        # Only measured every few messages, since most buffers are flushed after one or a few messages anyway
+        if len(self.buffer) % 64 == 0 and TealConfig.buffer_max_size > 0:
+            self._flush_if_full()
+
+    def _flush_if_full(self) -> None:
+        """Flush early if the messages are TealConfig.buffer_max_size large, to bound the memory of the buffer"""
+        if self.get_size() >= TealConfig.buffer_max_size:
+            self.flush()
 
-    def _add_to_buffer(self, message: str) -> None:
-        """Mostly used for mocking purposes"""
-        self.buffer.write(message + "\n")
+    def get_size(self) -> int:
+        """Approximate size of the messages in the buffer, in characters.
+        Messages that haven't been formatted yet are estimated instead, so that they're still only formatted when
+        they're written
+        """
+        records = self.buffer
+        count = len(records)
+        size = self._size
+        for record in records[self._measured : count]:  # noqa: E203
+            message = record.message
+            if not isinstance(message, str):
+                size += _estimated_lazy_size
+            else:
+                size += len(message) + 1 + _estimated_arg_size * len(record.args)
+        self._size = size
+        self._measured = count
+        return size
+
+    def getvalue(self) -> str:
+        """Returns all messages in the buffer that haven't been flushed yet, rendered for the console"""
+        return TealRenderer.get().render_records(self.buffer)
 
     def flush(self) -> None:
-        """Prints the messages in the buffer"""
-        self.buffer.seek(0)
+        """Writes the messages in the buffer to all sinks in TealConfig.sinks.
+        When TealPrint.enable_async() has been called, the messages are handed to the writer thread instead.
+        """
+        if len(self.buffer) == 0:
+            return
 
-        # Make sure we only print one message at a time
-        TealPrintBuffer._mutex.acquire()
+        lock = self._flush_lock
+        lock.acquire()
         try:
-            print(self.buffer.read(), flush=True, end="")
+            records = self._take()
+            if len(records) == 0:
+                return
+
+            writer = TealWriter.active
+            if writer:
+                TealPrintBuffer._format(records)
+                writer.put(records)
+            else:
+                TealPrintBuffer._write(records)
         finally:
-            TealPrintBuffer._mutex.release()
+            lock.release()
+
+    def flush_repeated(self) -> None:
+        """Like flush(), and first adds how many times the last message has been repeated since it was printed.
+        Used where no next message might come to print the count, e.g. by TealPrint.flush() and before exiting
+        """
+        self._add_repeated_summary()
+        self.flush()
+
+    async def aflush(self) -> None:
+        """Like flush(), but doesn't block the running event loop. Waits until the messages have been written,
+        so messages of the same task are written in order.
+        stdout and stderr are written through a non-blocking pipe transport of the loop when they're pipes or
+        terminals, other sinks are written in the loop's default executor.
+        When TealPrint.enable_async() has been called, the messages are handed to the writer thread instead.
+        """
+        if len(self.buffer) == 0:
+            return
+
+        with self._flush_lock:
+            records = self._take()
+        if len(records) == 0:
+            return
+        TealPrintBuffer._format(records)
+
+        writer = TealWriter.active
+        if writer:
+            writer.put(records)
+        else:
+            from .tealasync import TealAsyncWriter
+
+            await TealAsyncWriter.write_records(records)
+
+    def _take(self) -> List[TealRecord]:
+        """Remove the messages from the buffer to flush them. Called while holding the flush lock"""
+        # Only take the messages that are there now, since another thread can flush this buffer while messages
+        # are appended to it
+        count = len(self.buffer)
+        if count == 0:
+            return []
+        records = self.buffer[:count]
+        del self.buffer[:count]
+        self.pending_since = 0.0
+        self._size = 0
+        self._measured = 0
+
+        if TealStats.active is not None:
+            TealStats.active.add_flush()
+        return records
+
+    def dump_flight_recorder(self) -> None:
+        """Add the hidden messages kept by the flight recorder to the buffer, and clear the recorder.
+        The messages are indented as if all levels were shown. Call flush() to print the messages.
+        """
+        recorder = TealFlightRecorder.active
+        if recorder is None:
+            return
+
+        for record in recorder.take():
+            self._add_to_buffer(record)
+
+    def _flush_and_exit(self) -> None:
+        """Flushes the buffer, waits for the writer thread to write everything, and exits"""
+        self._add_repeated_summary()
+        self.dump_flight_recorder()
+        self.flush()
+        writer = TealWriter.active
+        if writer:
+            writer.drain()
+        sys.exit(1)
 
-        self.buffer = StringIO()
+    @staticmethod
+    def _format(records: List[TealRecord]) -> None:
+        """Format the messages before they're handed to another thread or task, which would otherwise format them
+        with the arguments as they are then, not as they were when the messages were printed
+        """
+        for record in records:
+            record.get_message()
 
     @staticmethod
-    def _remove_unicode_from_string(string: str) -> str:
-        """Remove all unicode characters from a string"""
-        return "".join(c for c in string if ord(c) < 128)
+    def _write(records: List[TealRecord]) -> None:
+        """Write the records to all sinks"""
+        stats = TealStats.active
+        if stats is None:
+            for sink in TealConfig.sinks:
+                sink.write(records)
+            return
+
+        start = perf_counter_ns()
+        for sink in TealConfig.sinks:
+            sink.write(records)
+        stats.add_flush_latency(perf_counter_ns() - start)
 
     @staticmethod
-    def _remove_colors_from_string(string: str) -> str:
-        """Removes all color characters from a string"""
-        return re.sub(r"\x1b\[\d+m", "", string)
+    def _write_batch(batch: List[List[TealRecord]]) -> None:
+        """Write several flushes at once, used by the writer thread"""
+        TealPrintBuffer._write([record for records in batch for record in records])
@@ -1,7 +1,10 @@
+import time
+
 import pytest
 from colored import fg
 
 from . import TealConfig, TealLevel, TealPrintBuffer
+from .tealratelimiter import TealRateLimiter
 
 indent = "".ljust(TealConfig.indent_by, TealConfig.indent_char)
 
@@ -95,8 +98,7 @@ def test_indentation(name, expected: str, function) -> None:
 
     function()
 
-    T.logger.buffer.seek(0)
-    result = T.logger.buffer.read()
+    result = T.logger.getvalue()
     assert expected == result
 
     T.reset()
@@ -107,8 +109,7 @@ def test_remove_unicode() -> None:
 
     T.logger.info("🔥 Rocket 🔥", color=fg("red"))
 
-    T.logger.buffer.seek(0)
-    result = T.logger.buffer.read()
+    result = T.logger.getvalue()
     assert " Rocket \n" == result
 
     TealConfig.reset()
@@ -120,9 +121,140 @@ def test_remove_colors() -> None:
 
     T.logger.info("🔥 Rocket 🔥", color=fg("red"))
 
-    T.logger.buffer.seek(0)
-    result = T.logger.buffer.read()
+    result = T.logger.getvalue()
     assert "🔥 Rocket 🔥\n" == result
 
     TealConfig.reset()
     T.reset()
+
+
+def test_indentation_follows_config_changes() -> None:
+    T.logger.push_indent(TealLevel.verbose)
+    T.logger.push_indent(TealLevel.info)
+    T.logger.info("once")
+    TealConfig.level = TealLevel.verbose
+    T.logger.info("twice")
+    T.logger.pop_indent()
+    T.logger.info("once again")
+    TealConfig.level = TealLevel.info
+    T.logger.info("not indented")
+
+    assert [1, 2, 1, 0] == [record.indent_level for record in T.logger.buffer]
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_rendered_when_flushed() -> None:
+    T.logger.push_indent(TealLevel.info)
+    T.logger.info("%d", args=(1,))
+    TealConfig.indent_by = 1
+
+    assert " 1\n" == T.logger.getvalue()
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_collapse_repeated_messages() -> None:
+    TealConfig.collapse_repeated = True
+
+    for _ in range(3):
+        T.logger.info("retrying")
+    T.logger.info("connected")
+    T.logger.info("connected")
+
+    assert "retrying\n(repeated 2 more times)\nconnected\n" == T.logger.getvalue()
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_collapse_prints_summary_periodically() -> None:
+    TealConfig.collapse_repeated = True
+    TealConfig.collapse_summary_interval = 0
+
+    for _ in range(3):
+        T.logger.info("retrying")
+
+    assert "retrying\n(repeated 1 more time)\n(repeated 1 more time)\n" == T.logger.getvalue()
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_max_size_does_not_format_lazy_messages() -> None:
+    calls = []
+
+    def message() -> str:
+        calls.append(1)
+        return "Lazy"
+
+    for _ in range(128):
+        T.logger.info(message)
+
+    assert [] == calls
+    T.reset()
+
+
+def test_rate_limit_per_key() -> None:
+    TealConfig.rate_limit = 0.001
+    TealConfig.rate_limit_burst = 2
+    TealConfig.colors_enabled = False
+
+    for i in range(5):
+        T.logger.warning("%d", args=(i,), key="retry")
+    T.logger.info("other", key="other")
+
+    assert "0\n1\nother\n" == T.logger.getvalue()
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_rate_limit_reports_suppressed_messages() -> None:
+    TealConfig.rate_limit = 1000
+    TealConfig.rate_limit_burst = 1
+    limiter = TealRateLimiter.get()
+
+    assert 0 == limiter.allow("key")
+    assert -1 == limiter.allow("key")
+    assert -1 == limiter.allow("key")
+    time.sleep(0.01)
+    assert 2 == limiter.allow("key")
+
+    TealConfig.reset()
+
+
+def test_rate_limit_per_callsite() -> None:
+    TealConfig.rate_limit = 0.001
+    TealConfig.rate_limit_burst = 1
+
+    for i in range(3):
+        T.logger.info("first")
+        T.logger.info("second")
+
+    assert "first\nsecond\n" == T.logger.getvalue()
+
+    TealConfig.reset()
+    T.reset()
+
+
+def test_flushes_early_at_max_size(capsys) -> None:
+    TealConfig.buffer_max_size = 12
+    TealConfig.colors_enabled = False
+
+    # The size is checked every 64 messages
+    for _ in range(63):
+        T.logger.info("x")
+    assert "" == capsys.readouterr().out
+
+    T.logger.info("x")
+    assert "x\n" * 64 == capsys.readouterr().out
+    assert "" == T.logger.getvalue()
+
+    T.logger.lines(["abcdefgh", "ijklmnop"])
+    assert "abcdefgh\nijklmnop\n" == capsys.readouterr().out
+
+    TealConfig.reset()
+    T.reset()
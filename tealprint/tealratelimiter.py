@@ -0,0 +1,77 @@
+import sys
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional
+
+from .tealconfig import TealConfig
+
+
+class TealRateLimiter:
+    """Token bucket rate limiter, with a separate bucket for each key.
+    Each bucket starts with burst tokens and gets rate tokens per second, up to burst tokens.
+    """
+
+    _current: Optional["TealRateLimiter"] = None
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Args:
+            rate (float): Messages per second that are allowed for each key
+            burst (int): How many messages can be allowed at once
+        """
+        self.rate = rate
+        self.burst = burst
+        # key -> [tokens, last update, suppressed messages]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def get() -> "TealRateLimiter":
+        """Get the rate limiter for TealConfig.rate_limit and TealConfig.rate_limit_burst"""
+        limiter = TealRateLimiter._current
+        if limiter is None or limiter.rate != TealConfig.rate_limit or limiter.burst != TealConfig.rate_limit_burst:
+            limiter = TealRateLimiter(TealConfig.rate_limit, TealConfig.rate_limit_burst)
+            TealRateLimiter._current = limiter
+        return limiter
+
+    def allow(self, key: str) -> int:
+        """Take a token for the key
+
+        Returns:
+            int: -1 if the message should be suppressed.
+                Otherwise the number of messages that were suppressed since the last allowed message
+        """
+        now = monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now, 0]
+                self._buckets[key] = bucket
+            else:
+                bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return -1
+
+            bucket[0] -= 1
+            suppressed = int(bucket[2])
+            bucket[2] = 0
+            return suppressed
+
+    @staticmethod
+    def callsite(key: Optional[str], depth: int) -> Optional[str]:
+        """Get the key for a message. Uses the file and line of the caller if no key is given and messages are
+        rate limited or sampled
+
+        Args:
+            key (Optional[str]): Explicit key of the message
+            depth (int): How many frames above the caller of this function the message was created
+        """
+        if key is not None or (
+            TealConfig.rate_limit <= 0 and TealConfig.sample_every <= 1 and TealConfig.sample_rate <= 0
+        ):
+            return key
+        frame = sys._getframe(depth + 1)
+        return f"{frame.f_code.co_filename}:{frame.f_lineno}"
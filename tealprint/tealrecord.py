@@ -0,0 +1,64 @@
+from threading import get_ident
+from time import time
+from typing import Any, Callable, Optional, Tuple, Union
+
+from .teallevel import TealLevel
+
+# A message, or a function returning the message. Functions are only called if the message is shown
+TealMessage = Union[str, Callable[[], str]]
+
+
+class TealRecord:
+    """A message in a buffer. The message is only formatted and rendered when it's written"""
+
+    __slots__ = ("level", "message", "args", "color", "indent_level", "timestamp", "thread_id", "worker", "channel")
+
+    def __init__(
+        self,
+        level: TealLevel,
+        message: TealMessage,
+        args: Tuple[Any, ...] = (),
+        color: str = "",
+        indent_level: int = 0,
+        timestamp: Optional[float] = None,
+        thread_id: Optional[int] = None,
+        worker: Optional[str] = None,
+        channel: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            level (TealLevel): Level of the message
+            message (TealMessage): The message, or a function returning it
+            args (Tuple[Any, ...]): Arguments for a %-format message
+            color (str): Color of the message, or an empty string
+            indent_level (int): Number of indentations
+            timestamp (float): When the message was created, defaults to now
+            thread_id (int): Id of the thread that created the message, defaults to the current thread
+            worker (Optional[str]): Name of the worker process that created the message, see TealCollector
+            channel (Optional[str]): Name of the TealChannel of the message
+        """
+        self.level = level
+        self.message = message
+        self.args = args
+        self.color = color
+        self.indent_level = indent_level
+        self.timestamp = time() if timestamp is None else timestamp
+        self.thread_id = get_ident() if thread_id is None else thread_id
+        self.worker = worker
+        self.channel = channel
+
+    def get_message(self) -> str:
+        """Format the message, only done once. A message that fails to format is replaced by the error, so that it
+        doesn't take the other messages of the flush with it
+        """
+        message = self.message
+        try:
+            if not isinstance(message, str):
+                message = message()
+            elif self.args:
+                message = message % self.args
+        except Exception as e:
+            message = f"(tealprint couldn't format the message {message!r}: {e!r})"
+        self.message = message
+        self.args = ()
+        return message
@@ -0,0 +1,133 @@
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from .tealconfig import Colors, TealConfig
+from .tealrecord import TealRecord
+
+
+class TealRenderer:
+    """Renders records for the console, for a snapshot of TealConfig.
+    The steps that are needed for the snapshot are chosen once, so rendering a message doesn't check the config.
+    """
+
+    # Renderers of the current TealConfig version, by colors and unicode
+    _current: Dict[Tuple[bool, bool], "TealRenderer"] = {}
+    _current_version = -1
+    # Matches all SGR (color and style) escape sequences, e.g. \x1b[0m, \x1b[1;4m and \x1b[38;5;208m.
+    # Compiled the first time it's needed
+    _sgr_pattern: Optional[Pattern[str]] = None
+
+    def __init__(self, colors: bool = True, unicode: bool = True) -> None:
+        """
+        Args:
+            colors (bool): If the output supports colors, they're only added if TealConfig.colors_enabled too
+            unicode (bool): If the output supports unicode, it's only kept if TealConfig.unicode_enabled too
+        """
+        self.version = TealConfig._version
+        self.reset = Colors.reset
+        self._indents: Dict[int, str] = {0: ""}
+
+        # render(message, color, indent) returns the indented and colored message
+        self.render: Callable[[str, str, str], str]
+        if not TealConfig.unicode_enabled or not unicode:
+            self.render = self._render_ascii
+        elif not TealConfig.colors_enabled or not colors:
+            self.render = self._render_without_colors
+        else:
+            self.render = self._render_colored
+
+    @staticmethod
+    def get(colors: bool = True, unicode: bool = True) -> "TealRenderer":
+        """Get the renderer for the current TealConfig, creating a new one if the config has changed
+
+        Args:
+            colors (bool): If the output supports colors, see TealTerminal
+            unicode (bool): If the output supports unicode, see TealTerminal
+        """
+        if TealRenderer._current_version != TealConfig._version:
+            TealRenderer._current = {}
+            TealRenderer._current_version = TealConfig._version
+
+        renderer = TealRenderer._current.get((colors, unicode))
+        if renderer is None:
+            renderer = TealRenderer(colors, unicode)
+            TealRenderer._current[(colors, unicode)] = renderer
+        return renderer
+
+    def render_records(self, records: List[TealRecord]) -> str:
+        """Render the records, one line per record"""
+        return "".join([self.render_record(record) + "\n" for record in records])
+
+    def render_record(self, record: TealRecord) -> str:
+        indent = self.get_indent(record.indent_level)
+        if record.worker is not None:
+            indent = f"[{record.worker}] {indent}"
+        return self.render(record.get_message(), record.color, indent)
+
+    def get_indent(self, indent_level: int) -> str:
+        """The indentation string for an indent level"""
+        indent = self._indents.get(indent_level)
+        if indent is None:
+            indent = "".ljust(indent_level * TealConfig.indent_by, TealConfig.indent_char)
+            self._indents[indent_level] = indent
+        return indent
+
+    def _render_colored(self, message: str, color: str, indent: str) -> str:
+        if len(color) > 0:
+            return f"{color}{indent}{message}{self.reset}"
+        return indent + message
+
+    def _render_without_colors(self, message: str, color: str, indent: str) -> str:
+        # Never add the color, only remove colors that are part of the message itself
+        return indent + TealRenderer.remove_colors(message)
+
+    def _render_ascii(self, message: str, color: str, indent: str) -> str:
+        return TealRenderer.remove_unicode(indent + TealRenderer.remove_colors(message))
+
+    @staticmethod
+    def remove_colors(string: str) -> str:
+        """Removes all color and style escape sequences from a string"""
+        if "\x1b" not in string:
+            return string
+        if TealRenderer._sgr_pattern is None:
+            import re
+
+            TealRenderer._sgr_pattern = re.compile(r"\x1b\[[0-9;]*m")
+        return TealRenderer._sgr_pattern.sub("", string)
+
+    @staticmethod
+    def remove_unicode(string: str) -> str:
+        """Remove all non-ascii characters from a string"""
+        if string.isascii():
+            return string
+        return string.encode("ascii", "ignore").decode("ascii")
+
+
+class TealJsonRenderer:
+    """Renders records as JSON Lines, one JSON object per line, for log ingestion"""
+
+    def render_records(self, records: List[TealRecord]) -> str:
+        """Render the records, one line per record"""
+        return "".join([self.render_record(record) + "\n" for record in records])
+
+    def render_record(self, record: TealRecord) -> str:
+        import json
+
+        return json.dumps(TealJsonRenderer.to_dict(record), ensure_ascii=False)
+
+    @staticmethod
+    def to_dict(record: TealRecord) -> Dict[str, Any]:
+        """The JSON fields of a record. Colors are removed from the message"""
+        fields = {
+            "time": record.timestamp,
+            "level": record.level.name,
+            "indent": record.indent_level,
+            "message": TealRenderer.remove_colors(record.get_message()),
+            "thread": record.thread_id,
+        }
+        if len(record.color) > 0:
+            fields["color"] = record.color
+        if record.worker is not None:
+            fields["worker"] = record.worker
+        if record.channel is not None:
+            fields["channel"] = record.channel
+        return fields
@@ -0,0 +1,42 @@
+import pytest
+
+from . import TealConfig
+from .tealrenderer import TealRenderer
+
+red = "\x1b[38;5;1m"
+bold = "\x1b[1m"
+reset = "\x1b[0m"
+
+
+@pytest.mark.parametrize(
+    "name,colors_enabled,unicode_enabled,message,color,expected",
+    [
+        ("Keeps message without color", True, True, "🔥 Rocket", "", "  🔥 Rocket"),
+        ("Keeps unicode when colors are disabled", False, True, "🔥 Rocket", "", "  🔥 Rocket"),
+        ("Doesn't add color when colors are disabled", False, True, "Rocket", red, "  Rocket"),
+        ("Removes 256 colors in the message", False, True, f"{red}Rocket{reset}", "", "  Rocket"),
+        ("Removes styles in the message", False, True, f"{bold}Rocket{reset}", "", "  Rocket"),
+        ("Removes unicode and colors", True, False, f"🔥 {red}Rocket{reset} 🔥", red, "   Rocket "),
+    ],
+)
+def test_render(
+    name: str, colors_enabled: bool, unicode_enabled: bool, message: str, color: str, expected: str
+) -> None:
+    print(name)
+
+    TealConfig.colors_enabled = colors_enabled
+    TealConfig.unicode_enabled = unicode_enabled
+
+    assert expected == TealRenderer.get().render(message, color, "  ")
+
+    TealConfig.reset()
+
+
+def test_renderer_is_reused_until_config_changes() -> None:
+    renderer = TealRenderer.get()
+    assert renderer is TealRenderer.get()
+
+    TealConfig.colors_enabled = False
+    assert renderer is not TealRenderer.get()
+
+    TealConfig.reset()
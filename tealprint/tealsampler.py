@@ -0,0 +1,74 @@
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional
+
+from .tealconfig import TealConfig
+from .tealratelimiter import TealRateLimiter
+
+
+class TealSampler:
+    """Keeps a sample of the messages of each key, e.g. 1 in 10, or 5 per second.
+    Counts the skipped messages, to report them at most every report_interval seconds.
+    """
+
+    _current: Optional["TealSampler"] = None
+
+    def __init__(self, every: int, rate: float, report_interval: float) -> None:
+        """
+        Args:
+            every (int): Keep 1 in this many messages, 0 or 1 to keep all
+            rate (float): Keep at most this many messages per second, 0 for no limit
+            report_interval (float): Minimum seconds between reports of skipped messages, for each key
+        """
+        self.every = every
+        self.rate = rate
+        self.report_interval = report_interval
+        # Messages per second are rate limited, allowing a second's worth of messages at once
+        self._limiter = TealRateLimiter(rate, max(1, int(rate))) if rate > 0 else None
+        # key -> [messages seen, skipped since the last report, time of the last report]
+        self._keys: Dict[str, List[float]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def get() -> "TealSampler":
+        """Get the sampler for TealConfig.sample_every, TealConfig.sample_rate and TealConfig.sample_report_interval"""
+        sampler = TealSampler._current
+        if (
+            sampler is None
+            or sampler.every != TealConfig.sample_every
+            or sampler.rate != TealConfig.sample_rate
+            or sampler.report_interval != TealConfig.sample_report_interval
+        ):
+            sampler = TealSampler(TealConfig.sample_every, TealConfig.sample_rate, TealConfig.sample_report_interval)
+            TealSampler._current = sampler
+        return sampler
+
+    def sample(self, key: str) -> int:
+        """Check if the message is kept
+
+        Returns:
+            int: -1 if the message should be skipped.
+                Otherwise the number of messages that were skipped since the last report, if it's time to report them
+        """
+        now = monotonic()
+        with self._lock:
+            state = self._keys.get(key)
+            if state is None:
+                state = [0, 0, now]
+                self._keys[key] = state
+
+            # The first message is always kept
+            keep = self.every <= 1 or state[0] % self.every == 0
+            state[0] += 1
+            if keep and self._limiter is not None:
+                keep = self._limiter.allow(key) >= 0
+            if not keep:
+                state[1] += 1
+                return -1
+
+            if state[1] > 0 and now - state[2] >= self.report_interval:
+                skipped = int(state[1])
+                state[1] = 0
+                state[2] = now
+                return skipped
+            return 0
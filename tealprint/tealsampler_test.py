@@ -0,0 +1,107 @@
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint
+from . import tealratelimiter, tealsampler
+
+
+@pytest.fixture(autouse=True)
+def debug_level():
+    TealConfig.colors_enabled = False
+    TealConfig.level = TealLevel.debug
+    yield
+    TealConfig.reset()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tealsampler, "monotonic", lambda: now[0])
+    monkeypatch.setattr(tealratelimiter, "monotonic", lambda: now[0])
+    return now
+
+
+def test_one_in_n_per_callsite(capsys) -> None:
+    TealConfig.sample_every = 3
+    TealConfig.sample_report_interval = 0
+
+    for i in range(7):
+        TealPrint.debug("Message %d", args=(i,))
+
+    assert (
+        "Message 0\n(2 messages were skipped by sampling)\nMessage 3\n"
+        + ("(2 messages were skipped by sampling)\nMessage 6\n")
+        == capsys.readouterr().out
+    )
+
+
+@pytest.mark.parametrize(
+    "name,function,sampled",
+    [
+        ("Error", TealPrint.error, False),
+        ("Warning", TealPrint.warning, False),
+        ("Info", TealPrint.info, False),
+        ("Verbose", TealPrint.verbose, True),
+        ("Debug", TealPrint.debug, True),
+    ],
+)
+def test_only_debug_and_verbose_are_sampled(name: str, function, sampled: bool, capsys) -> None:
+    print(name)
+    capsys.readouterr()
+    TealConfig.sample_every = 2
+
+    for _ in range(4):
+        function("Message")
+
+    expected = 2 if sampled else 4
+    assert expected == capsys.readouterr().out.count("Message")
+
+
+def test_keys_are_sampled_separately(capsys) -> None:
+    TealConfig.sample_every = 2
+
+    for i in range(2):
+        TealPrint.debug("a%d", args=(i,), key="a")
+        TealPrint.debug("b%d", args=(i,), key="b")
+
+    assert "a0\nb0\n" == capsys.readouterr().out
+
+
+def test_messages_per_second(clock, capsys) -> None:
+    TealConfig.sample_rate = 2
+    TealConfig.sample_report_interval = 60
+
+    for i in range(5):
+        TealPrint.debug("Message %d", args=(i,), key="same")
+    clock[0] += 1
+    TealPrint.debug("Later", key="same")
+    clock[0] += 60
+    TealPrint.debug("Report", key="same")
+
+    assert "Message 0\nMessage 1\nLater\n(3 messages were skipped by sampling)\nReport\n" == capsys.readouterr().out
+
+
+def test_skipped_messages_are_not_formatted(capsys) -> None:
+    TealConfig.sample_every = 10
+    calls = []
+
+    for _ in range(10):
+        TealPrint.debug(lambda: calls.append(1) or "Lazy")
+
+    assert 1 == len(calls)
+    assert "Lazy\n" == capsys.readouterr().out
+
+
+def test_skipped_messages_are_counted() -> None:
+    TealConfig.sample_every = 4
+    TealConfig.sinks = []
+    TealPrint.enable_stats()
+    try:
+        for _ in range(8):
+            TealPrint.verbose("Message")
+
+        stats = TealPrint.get_stats()
+        assert stats is not None
+        assert 2 == stats["emitted"]["verbose"]
+        assert 6 == stats["suppressed"]["verbose"]
+    finally:
+        TealPrint.disable_stats()
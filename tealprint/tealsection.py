@@ -0,0 +1,151 @@
+from contextvars import ContextVar, Token
+from functools import wraps
+from time import perf_counter_ns, thread_time_ns
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .teallevel import TealLevel
+from .tealprint import TealPrint
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The innermost section that is running in the current thread or asyncio task
+_section_var: ContextVar[Optional["TealSection"]] = ContextVar("tealprint_section", default=None)
+
+
+class TealTiming:
+    """Time spent in a section and the sections inside it. Sections with the same header are added together"""
+
+    __slots__ = ("count", "wall_ns", "cpu_ns", "children")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.children: Dict[str, "TealTiming"] = {}
+
+    def add(self, timing: "TealTiming") -> None:
+        self.count += timing.count
+        self.wall_ns += timing.wall_ns
+        self.cpu_ns += timing.cpu_ns
+        for header, child in timing.children.items():
+            self.children.setdefault(header, TealTiming()).add(child)
+
+
+class TealSection:
+    """Prints a header and indents all messages inside the section. When the section ends, the indentation is
+    removed and the wall and CPU time of the section is printed. The outermost section also prints a summary tree
+    of where the time went in the sections inside it.
+    The CPU time is that of the current thread, so other threads don't count, but other asyncio tasks that run on the
+    thread while an async section waits do.
+    Use TealPrint.section() to create it, as a context manager or as a decorator.
+    """
+
+    def __init__(self, header: str, level: TealLevel = TealLevel.info) -> None:
+        """
+        Args:
+            header (str): Printed when the section starts, and used as the name of the section in the summary
+            level (TealLevel): Level of the header and the times. Nothing is timed if the level is hidden
+        """
+        self.header = header
+        self.level = level
+        self.timing = TealTiming()
+        self._indent_depth = 0
+        self._enabled = False
+        self._token: Optional[Token] = None
+        self._wall_start = 0
+        self._cpu_start = 0
+
+    def __enter__(self) -> "TealSection":
+        buffer = TealPrint._get_buffer()
+        self._indent_depth = len(buffer.indent_stack)
+        self._enabled = TealPrint.is_enabled(self.level)
+        self._print(self.header, push_indent=True)
+
+        if self._enabled:
+            self.timing = TealTiming()
+            self._token = _section_var.set(self)
+            self._cpu_start = thread_time_ns()
+            self._wall_start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        # Also unwinds indentation that was pushed inside the section and not popped because of an exception
+        buffer = TealPrint._get_buffer()
+        while len(buffer.indent_stack) > self._indent_depth:
+            buffer.pop_indent()
+
+        if not self._enabled:
+            return
+
+        self.timing.wall_ns = perf_counter_ns() - self._wall_start
+        self.timing.cpu_ns = thread_time_ns() - self._cpu_start
+        self.timing.count = 1
+        if self._token is not None:
+            _section_var.reset(self._token)
+            self._token = None
+
+        result = "failed after" if exc_type is not None else "done in"
+        self._print(f"{self.header} {result} {TealSection._format_timing(self.timing)}")
+
+        parent = _section_var.get()
+        if parent is not None:
+            parent.timing.children.setdefault(self.header, TealTiming()).add(self.timing)
+        elif len(self.timing.children) > 0:
+            self._print_summary(self.timing.children)
+
+    def __call__(self, function: F) -> F:
+        """Use the section as a decorator, each call of the function is a section"""
+        import inspect
+
+        if inspect.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def wrap_async(*args: Any, **kwargs: Any) -> Any:
+                with TealSection(self.header, self.level):
+                    return await function(*args, **kwargs)
+
+            return wrap_async  # type: ignore
+
+        @wraps(function)
+        def wrap(*args: Any, **kwargs: Any) -> Any:
+            with TealSection(self.header, self.level):
+                return function(*args, **kwargs)
+
+        return wrap  # type: ignore
+
+    def _print_summary(self, children: Dict[str, TealTiming]) -> None:
+        TealPrint.push_indent(self.level)
+        for header, timing in children.items():
+            self._print(f"{header}: {TealSection._format_timing(timing)}")
+            if len(timing.children) > 0:
+                self._print_summary(timing.children)
+        TealPrint.pop_indent()
+
+    def _print(self, message: str, push_indent: bool = False) -> None:
+        # Rate limited per section instead of per line in this file
+        key = f"section:{self.header}"
+        if self.level == TealLevel.error:
+            TealPrint.error(message, push_indent=push_indent, key=key)
+        elif self.level == TealLevel.warning:
+            TealPrint.warning(message, push_indent=push_indent, key=key)
+        elif self.level == TealLevel.info:
+            TealPrint.info(message, push_indent=push_indent, key=key)
+        elif self.level == TealLevel.verbose:
+            TealPrint.verbose(message, push_indent=push_indent, key=key)
+        else:
+            TealPrint.debug(message, push_indent=push_indent, key=key)
+
+    @staticmethod
+    def _format_timing(timing: TealTiming) -> str:
+        text = f"{TealSection._format_ns(timing.wall_ns)} (cpu {TealSection._format_ns(timing.cpu_ns)})"
+        if timing.count > 1:
+            text += f" in {timing.count} calls"
+        return text
+
+    @staticmethod
+    def _format_ns(ns: int) -> str:
+        if ns >= 1_000_000_000:
+            return f"{ns / 1e9:.2f} s"
+        if ns >= 1_000_000:
+            return f"{ns / 1e6:.1f} ms"
+        return f"{ns / 1e3:.0f} us"
@@ -0,0 +1,87 @@
+import asyncio
+from itertools import count
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, tealsection
+
+
+@pytest.fixture(autouse=True)
+def clocks(monkeypatch):
+    # Every reading of the clocks is 1 ms (wall) and 0.5 ms (cpu) later than the previous one
+    wall = count(0, 1_000_000)
+    cpu = count(0, 500_000)
+    monkeypatch.setattr(tealsection, "perf_counter_ns", lambda: next(wall))
+    monkeypatch.setattr(tealsection, "thread_time_ns", lambda: next(cpu))
+    TealConfig.colors_enabled = False
+    yield
+    TealConfig.reset()
+
+
+def test_prints_header_indents_and_times(capsys) -> None:
+    with TealPrint.section("Build"):
+        TealPrint.info("Working")
+
+    assert "Build\n    Working\nBuild done in 1.0 ms (cpu 500 us)\n" == capsys.readouterr().out
+
+
+def test_nested_sections_print_summary(capsys) -> None:
+    with TealPrint.section("Build"):
+        for _ in range(2):
+            with TealPrint.section("Compile"):
+                pass
+        with TealPrint.section("Link"):
+            pass
+
+    assert [
+        "Build",
+        "    Compile",
+        "    Compile done in 1.0 ms (cpu 500 us)",
+        "    Compile",
+        "    Compile done in 1.0 ms (cpu 500 us)",
+        "    Link",
+        "    Link done in 1.0 ms (cpu 500 us)",
+        "Build done in 7.0 ms (cpu 3.5 ms)",
+        "    Compile: 2.0 ms (cpu 1.0 ms) in 2 calls",
+        "    Link: 1.0 ms (cpu 500 us)",
+    ] == capsys.readouterr().out.splitlines()
+
+
+def test_exception_unwinds_indentation(capsys) -> None:
+    with pytest.raises(ValueError):
+        with TealPrint.section("Build"):
+            TealPrint.push_indent(TealLevel.info)
+            TealPrint.push_indent(TealLevel.info)
+            raise ValueError()
+    TealPrint.info("Not indented")
+
+    assert "Build\nBuild failed after 1.0 ms (cpu 500 us)\nNot indented\n" == capsys.readouterr().out
+
+
+def test_hidden_level_is_not_timed(capsys) -> None:
+    with TealPrint.section("Build", TealLevel.verbose):
+        TealPrint.info("Not indented")
+
+    assert "Not indented\n" == capsys.readouterr().out
+    # The clock was never read
+    assert 0 == tealsection.perf_counter_ns()
+
+
+def test_decorator(capsys) -> None:
+    @TealPrint.section("Compile")
+    def compile(value: int) -> int:
+        TealPrint.info("Compiling")
+        return value
+
+    assert 1 == compile(1)
+    assert "Compile\n    Compiling\nCompile done in 1.0 ms (cpu 500 us)\n" == capsys.readouterr().out
+
+
+def test_async_decorator(capsys) -> None:
+    @TealPrint.section("Fetch")
+    async def fetch() -> int:
+        await asyncio.sleep(0)
+        return 1
+
+    assert 1 == asyncio.run(fetch())
+    assert "Fetch\nFetch done in 1.0 ms (cpu 500 us)\n" == capsys.readouterr().out
@@ -0,0 +1,304 @@
+import os
+import sys
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import perf_counter_ns
+from typing import BinaryIO, List, Optional, TextIO, Union
+
+from .teallevel import TealLevel
+from .tealrecord import TealRecord
+from .tealrenderer import TealJsonRenderer, TealRenderer
+from .tealstats import TealStats
+from .tealterminal import TealTerminal
+
+# Moves the cursor to the start of the line and clears it
+clear_line = "\r\x1b[2K"
+
+# Windows translates newlines in the text layer, so only bypass it on other platforms
+_write_to_fd = os.name != "nt"
+
+
+class TealSink(ABC):
+    """Where flushed messages are written. Only messages of the sink's level or lower are written to it.
+    Subclass TealTextSink for sinks that write rendered text
+    """
+
+    # Only one sink writes at a time
+    _mutex = Lock()
+
+    def __init__(
+        self,
+        level: TealLevel = TealLevel.debug,
+        renderer: Union[TealRenderer, TealJsonRenderer, None] = None,
+    ) -> None:
+        """
+        Args:
+            level (TealLevel): Highest level that is written to this sink
+            renderer (Union[TealRenderer, TealJsonRenderer, None]): How records are rendered.
+                Defaults to the console format of the current TealConfig
+        """
+        self.level = level
+        self.renderer = renderer
+
+    @abstractmethod
+    def write(self, records: List[TealRecord]) -> None:
+        """Write the records that are of the sink's level or lower"""
+
+    def get_renderer(self) -> Union[TealRenderer, TealJsonRenderer]:
+        """The renderer of the sink, or the console renderer of the current TealConfig"""
+        return self.renderer or TealRenderer.get()
+
+    def close(self) -> None:
+        pass
+
+
+class TealTextSink(TealSink):
+    """A sink that renders the records of a flush as text, and writes it with a single write"""
+
+    def write(self, records: List[TealRecord]) -> None:
+        """Render the records that are of the sink's level or lower, and write them"""
+        text = self.render(records)
+        if len(text) > 0:
+            stats = TealStats.active
+            if stats is None:
+                TealSink._mutex.acquire()
+            else:
+                stats.add_rendered(len(text))
+                start = perf_counter_ns()
+                TealSink._mutex.acquire()
+                stats.add_lock_wait(perf_counter_ns() - start)
+            try:
+                self.write_text(text)
+            finally:
+                TealSink._mutex.release()
+
+    def render(self, records: List[TealRecord]) -> str:
+        """Render the records that are of the sink's level or lower"""
+        if self.level != TealLevel.debug:
+            records = [record for record in records if record.level.value <= self.level.value]
+        if len(records) == 0:
+            return ""
+
+        return self.get_renderer().render_records(records)
+
+    @abstractmethod
+    def write_text(self, text: str) -> None:
+        """Write the text with a single write. Called while holding the write lock"""
+
+
+class TealNullSink(TealSink):
+    """Discards all messages"""
+
+    def write(self, records: List[TealRecord]) -> None:
+        pass
+
+
+class TealStreamSink(TealTextSink):
+    """Writes to stdout, stderr or another stream.
+    Messages are written directly to the file descriptor of the stream, bypassing print() and the text layer.
+    """
+
+    # A line kept at the bottom of a terminal, e.g. the status line of TealPrint.status().
+    # It's cleared before messages are written to footer_stream and drawn again after them
+    footer = ""
+    footer_stream: Optional[TextIO] = None
+
+    def __init__(
+        self,
+        stream: Union[str, TextIO] = "stdout",
+        level: TealLevel = TealLevel.debug,
+        renderer: Union[TealRenderer, TealJsonRenderer, None] = None,
+    ) -> None:
+        """
+        Args:
+            stream (Union[str, TextIO]): "stdout", "stderr" or a stream. stdout and stderr are looked up when writing,
+                so that they can be redirected
+            level (TealLevel): Highest level that is written to this sink
+            renderer (Union[TealRenderer, TealJsonRenderer, None]): How records are rendered.
+                Defaults to the console format of the current TealConfig
+        """
+        super().__init__(level, renderer)
+        self.stream = stream
+        # What the stream supports, only probed again when the stream changes
+        self._terminal = TealTerminal(False, False, False)
+        self._terminal_stream: Optional[TextIO] = None
+
+    def get_stream(self) -> TextIO:
+        if isinstance(self.stream, str):
+            return getattr(sys, self.stream)
+        return self.stream
+
+    def get_terminal(self) -> TealTerminal:
+        """What the stream supports, e.g. colors are only written to terminals"""
+        stream = self.get_stream()
+        if stream is not self._terminal_stream:
+            self._terminal = TealTerminal.probe(stream)
+            self._terminal_stream = stream
+        return self._terminal
+
+    def get_renderer(self) -> Union[TealRenderer, TealJsonRenderer]:
+        if self.renderer is not None:
+            return self.renderer
+        terminal = self.get_terminal()
+        return TealRenderer.get(terminal.colors, terminal.unicode)
+
+    def write_text(self, text: str) -> None:
+        stream = self.get_stream()
+        self.write_to_stream(stream, self.add_footer(stream, text))
+
+    def add_footer(self, stream: TextIO, text: str) -> str:
+        """If the stream has a footer, write the text over it and draw it again below the text"""
+        if len(TealStreamSink.footer) > 0 and stream is TealStreamSink.footer_stream:
+            return clear_line + text + TealStreamSink.footer
+        return text
+
+    def write_to_stream(self, stream: TextIO, text: str) -> None:
+        """Write the text as is to the stream. Called while holding the write lock"""
+        fd = TealStreamSink._get_fd(stream)
+        if fd is None:
+            stream.write(text)
+            stream.flush()
+            if TealStats.active is not None:
+                TealStats.active.add_written(len(text))
+            return
+
+        # Anything written through the stream's own buffer has to come first
+        stream.flush()
+        # Characters that the console can't encode are dropped
+        data = text.encode(stream.encoding or "utf-8", "ignore")
+        _write_all(fd, data)
+        if TealStats.active is not None:
+            TealStats.active.add_written(len(data))
+
+    @staticmethod
+    def _get_fd(stream: TextIO) -> Optional[int]:
+        if not _write_to_fd:
+            return None
+        try:
+            return stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            # Not backed by a file descriptor, e.g. StringIO or captured output
+            return None
+
+
+class TealFileSink(TealTextSink):
+    """Appends messages to a file, encoded as utf-8"""
+
+    def __init__(
+        self,
+        path: str,
+        level: TealLevel = TealLevel.debug,
+        buffer_size: int = 0,
+        renderer: Union[TealRenderer, TealJsonRenderer, None] = None,
+    ) -> None:
+        """
+        Args:
+            path (str): The file to append to, created if it doesn't exist
+            level (TealLevel): Highest level that is written to this sink
+            buffer_size (int): 0 to write every flush to the OS directly.
+                Otherwise messages are collected until buffer_size bytes have been written, or the sink is closed
+            renderer (Union[TealRenderer, TealJsonRenderer, None]): How records are rendered, e.g. TealJsonRenderer()
+                for JSON Lines. Defaults to the console format of the current TealConfig
+        """
+        super().__init__(level, renderer)
+        self.path = path
+        self.buffer_size = buffer_size
+        self._file: Optional[BinaryIO] = None
+        self._terminal = TealTerminal.file()
+
+    def get_renderer(self) -> Union[TealRenderer, TealJsonRenderer]:
+        if self.renderer is not None:
+            return self.renderer
+        return TealRenderer.get(self._terminal.colors, self._terminal.unicode)
+
+    def write_text(self, text: str) -> None:
+        if self._file is None:
+            self._open()
+        self._write(text.encode("utf-8"))
+
+    def _open(self) -> None:
+        self._file = open(self.path, "ab", buffering=self.buffer_size)
+
+    def _write(self, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(data)
+        if TealStats.active is not None:
+            TealStats.active.add_written(len(data))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TealRotatingFileSink(TealFileSink):
+    """Appends messages to a file, and starts a new file when it gets larger than max_bytes.
+    Old files are renamed to path.1, path.2, ... up to backup_count.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        backup_count: int = 3,
+        level: TealLevel = TealLevel.debug,
+        buffer_size: int = 0,
+        renderer: Union[TealRenderer, TealJsonRenderer, None] = None,
+    ) -> None:
+        """
+        Args:
+            path (str): The file to append to, created if it doesn't exist
+            max_bytes (int): Maximum size of a file before a new one is started
+            backup_count (int): How many old files to keep
+            level (TealLevel): Highest level that is written to this sink
+            buffer_size (int): 0 to write every flush to the OS directly.
+                Otherwise messages are collected until buffer_size bytes have been written, or the sink is closed
+            renderer (Union[TealRenderer, TealJsonRenderer, None]): How records are rendered, e.g. TealJsonRenderer()
+                for JSON Lines. Defaults to the console format of the current TealConfig
+        """
+        super().__init__(path, level, buffer_size, renderer)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._size = 0
+
+    def _open(self) -> None:
+        super()._open()
+        self._size = os.path.getsize(self.path)
+
+    def _write(self, data: bytes) -> None:
+        if self._size > 0 and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        super()._write(data)
+        self._size += len(data)
+
+    def _rotate(self) -> None:
+        self.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all data to the file descriptor, os.write() may only write parts of it"""
+    view = memoryview(data)
+    while len(view) > 0:
+        try:
+            written = os.write(fd, view)
+        except BlockingIOError:
+            # Someone else has made the stream non-blocking, wait until the pipe has room again
+            import select
+
+            select.select([], [fd], [])
+            continue
+        view = view[written:]
+
+
+if hasattr(os, "register_at_fork"):
+    # Another thread might have been writing when forking, which would leave the lock locked in the child
+    os.register_at_fork(after_in_child=lambda: setattr(TealSink, "_mutex", Lock()))
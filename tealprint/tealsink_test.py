@@ -0,0 +1,148 @@
+import json
+import os
+from typing import List
+
+import pytest
+
+from . import (
+    TealConfig,
+    TealFileSink,
+    TealJsonRenderer,
+    TealLevel,
+    TealNullSink,
+    TealPrint,
+    TealRecord,
+    TealRotatingFileSink,
+    TealSink,
+    TealStreamSink,
+    TealTextSink,
+)
+
+messages = [
+    TealRecord(TealLevel.error, "error"),
+    TealRecord(TealLevel.warning, "warning"),
+    TealRecord(TealLevel.info, "info"),
+    TealRecord(TealLevel.debug, "debug"),
+]
+
+
+def test_stream_sink_writes_to_file_descriptor(capfd) -> None:
+    TealStreamSink().write(messages)
+
+    assert "error\nwarning\ninfo\ndebug\n" == capfd.readouterr().out
+
+
+def test_stream_sink_writes_to_stderr(capsys) -> None:
+    TealStreamSink("stderr").write(messages)
+
+    captured = capsys.readouterr()
+    assert "" == captured.out
+    assert "error\nwarning\ninfo\ndebug\n" == captured.err
+
+
+@pytest.mark.parametrize(
+    "name,level,expected",
+    [
+        ("Writes everything on debug", TealLevel.debug, "error\nwarning\ninfo\ndebug\n"),
+        ("Skips debug on info", TealLevel.info, "error\nwarning\ninfo\n"),
+        ("Only errors on error", TealLevel.error, "error\n"),
+    ],
+)
+def test_sink_level(name: str, level: TealLevel, expected: str, tmp_path) -> None:
+    print(name)
+    path = str(tmp_path / "log.txt")
+
+    sink = TealFileSink(path, level)
+    sink.write(messages)
+    sink.close()
+
+    with open(path) as file:
+        assert expected == file.read()
+
+
+def test_file_sink_appends(tmp_path) -> None:
+    path = str(tmp_path / "log.txt")
+    with open(path, "w") as file:
+        file.write("existing\n")
+
+    sink = TealFileSink(path, buffer_size=4096)
+    sink.write(messages[:1])
+    sink.write(messages[1:2])
+    sink.close()
+
+    with open(path) as file:
+        assert "existing\nerror\nwarning\n" == file.read()
+
+
+def test_rotating_file_sink(tmp_path) -> None:
+    path = str(tmp_path / "log.txt")
+
+    sink = TealRotatingFileSink(path, max_bytes=12, backup_count=2)
+    for message in ["first", "second", "third", "fourth"]:
+        sink.write([TealRecord(TealLevel.info, message)])
+    sink.close()
+
+    with open(path) as file:
+        assert "fourth\n" == file.read()
+    with open(f"{path}.1") as file:
+        assert "third\n" == file.read()
+    with open(f"{path}.2") as file:
+        assert "second\n" == file.read()
+    assert not os.path.exists(f"{path}.3")
+
+
+def test_multiple_sinks(tmp_path, capsys) -> None:
+    path = str(tmp_path / "debug.txt")
+    file_sink = TealFileSink(path)
+    TealConfig.level = TealLevel.debug
+    TealConfig.colors_enabled = False
+    TealConfig.sinks = [TealStreamSink("stderr", TealLevel.error), file_sink, TealNullSink()]
+
+    TealPrint.error("Failed")
+    TealPrint.debug("Details")
+    file_sink.close()
+
+    assert "Failed\n" == capsys.readouterr().err
+    with open(path) as file:
+        assert "Failed\nDetails\n" == file.read()
+
+    TealConfig.reset()
+
+
+def test_json_lines(tmp_path) -> None:
+    path = str(tmp_path / "log.jsonl")
+    sink = TealFileSink(path, renderer=TealJsonRenderer())
+
+    sink.write([TealRecord(TealLevel.warning, "🔥 %s", ("Hot",), "\x1b[38;5;1m", 2, 10.5, 1)])
+    sink.close()
+
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert [
+        {"time": 10.5, "level": "warning", "indent": 2, "message": "🔥 Hot", "thread": 1, "color": "\x1b[38;5;1m"}
+    ] == [json.loads(line) for line in lines]
+
+
+def test_custom_text_sink(capsys) -> None:
+    class ListSink(TealTextSink):
+        def __init__(self) -> None:
+            super().__init__(TealLevel.info)
+            self.texts: List[str] = []
+
+        def write_text(self, text: str) -> None:
+            self.texts.append(text)
+
+    sink = ListSink()
+    TealConfig.colors_enabled = False
+    sink.write(messages)
+
+    assert ["error\nwarning\ninfo\n"] == sink.texts
+    TealConfig.reset()
+
+
+def test_sinks_have_to_implement_write() -> None:
+    class NoWrite(TealSink):
+        pass
+
+    with pytest.raises(TypeError):
+        NoWrite()  # type: ignore
@@ -0,0 +1,96 @@
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from .teallevel import TealLevel
+
+# Flush latencies are counted in buckets of powers of two microseconds: <1µs, <2µs, <4µs, ..., and the rest
+_bucket_count = 32
+
+
+class TealStats:
+    """Counts what tealprint does, to see how much time is spent printing.
+    Only collected when enabled through TealPrint.enable_stats(), otherwise it costs a single check of active.
+    """
+
+    active: Optional["TealStats"] = None
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all counters to 0"""
+        with self._lock:
+            # Indexed by TealLevel.value
+            self.emitted: List[int] = [0] * len(TealLevel)
+            self.suppressed: List[int] = [0] * len(TealLevel)
+            self.chars_rendered = 0
+            self.bytes_written = 0
+            self.flushes = 0
+            self.lock_wait_ns = 0
+            self.flush_latency_buckets: List[int] = [0] * _bucket_count
+            self.flush_latency_total_ns = 0
+            self.flush_latency_max_ns = 0
+
+    def add_emitted(self, level: TealLevel, count: int = 1) -> None:
+        with self._lock:
+            self.emitted[level.value] += count
+
+    def add_suppressed(self, level: TealLevel) -> None:
+        """A message that was hidden by the level, rate limited or collapsed"""
+        with self._lock:
+            self.suppressed[level.value] += 1
+
+    def add_flush(self) -> None:
+        with self._lock:
+            self.flushes += 1
+
+    def add_rendered(self, chars: int) -> None:
+        with self._lock:
+            self.chars_rendered += chars
+
+    def add_written(self, size: int) -> None:
+        with self._lock:
+            self.bytes_written += size
+
+    def add_lock_wait(self, ns: int) -> None:
+        with self._lock:
+            self.lock_wait_ns += ns
+
+    def add_flush_latency(self, ns: int) -> None:
+        """Time it took to write a flush to all sinks"""
+        bucket = min((ns // 1000).bit_length(), _bucket_count - 1)
+        with self._lock:
+            self.flush_latency_buckets[bucket] += 1
+            self.flush_latency_total_ns += ns
+            if ns > self.flush_latency_max_ns:
+                self.flush_latency_max_ns = ns
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns a copy of all counters as a dict, which can e.g. be dumped as JSON.
+        The flush latency histogram maps the upper bound in microseconds of each bucket to its count.
+        Only buckets with a count are included, and the last bucket has no upper bound ("inf").
+        """
+        with self._lock:
+            buckets: Dict[str, int] = {}
+            for i, count in enumerate(self.flush_latency_buckets):
+                if count > 0:
+                    upper = "inf" if i == _bucket_count - 1 else str(1 << i)
+                    buckets[upper] = count
+
+            return {
+                "emitted": {level.name: self.emitted[level.value] for level in TealLevel if level != TealLevel.none},
+                "suppressed": {
+                    level.name: self.suppressed[level.value] for level in TealLevel if level != TealLevel.none
+                },
+                "chars_rendered": self.chars_rendered,
+                "bytes_written": self.bytes_written,
+                "flushes": self.flushes,
+                "lock_wait_seconds": self.lock_wait_ns / 1e9,
+                "flush_latency": {
+                    "count": sum(self.flush_latency_buckets),
+                    "total_seconds": self.flush_latency_total_ns / 1e9,
+                    "max_seconds": self.flush_latency_max_ns / 1e9,
+                    "buckets_us": buckets,
+                },
+            }
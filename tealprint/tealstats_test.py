@@ -0,0 +1,94 @@
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, TealPrintBuffer, TealStats
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    TealConfig.level = TealLevel.info
+    TealConfig.colors_enabled = False
+    TealPrint.enable_stats()
+    yield
+    TealPrint.disable_stats()
+    TealConfig.reset()
+
+
+def test_counts_emitted_and_suppressed_messages(capsys) -> None:
+    TealPrint.error("Error")
+    TealPrint.info("Info")
+    TealPrint.info("Info")
+    TealPrint.verbose("Verbose")
+    TealPrint.debug("Debug", push_indent=True)
+    TealPrint.pop_indent()
+
+    stats = TealPrint.get_stats()
+
+    assert stats is not None
+    assert {"error": 1, "warning": 0, "info": 2, "verbose": 0, "debug": 0} == stats["emitted"]
+    assert {"error": 0, "warning": 0, "info": 0, "verbose": 1, "debug": 1} == stats["suppressed"]
+
+
+def test_counts_collapsed_messages_as_suppressed(capsys) -> None:
+    TealConfig.collapse_repeated = True
+    buffer = TealPrintBuffer()
+    for _ in range(3):
+        buffer.info("Same")
+    buffer.flush()
+
+    stats = TealPrint.get_stats()
+
+    assert stats is not None
+    assert 1 == stats["emitted"]["info"]
+    assert 2 == stats["suppressed"]["info"]
+
+
+def test_counts_bytes_and_flushes(capfd) -> None:
+    TealPrint.info("ö")
+    TealPrint.info("ab")
+
+    stats = TealPrint.get_stats()
+
+    assert stats is not None
+    assert 2 == stats["flushes"]
+    assert 5 == stats["chars_rendered"]
+    assert 6 == stats["bytes_written"]
+    assert 2 == stats["flush_latency"]["count"]
+    assert 2 == sum(stats["flush_latency"]["buckets_us"].values())
+
+
+@pytest.mark.parametrize(
+    "name,ns,expected",
+    [
+        ("Below 1µs", 999, "1"),
+        ("Exactly 1µs", 1000, "2"),
+        ("3µs", 3999, "4"),
+        ("1ms", 1_000_000, "1024"),
+        ("Longer than the last bucket", 10**16, "inf"),
+    ],
+)
+def test_flush_latency_buckets(name: str, ns: int, expected: str) -> None:
+    print(name)
+    stats = TealStats()
+
+    stats.add_flush_latency(ns)
+
+    assert {expected: 1} == stats.snapshot()["flush_latency"]["buckets_us"]
+
+
+def test_reset(capsys) -> None:
+    TealPrint.info("Info")
+    TealPrint.reset_stats()
+
+    stats = TealPrint.get_stats()
+
+    assert stats is not None
+    assert 0 == stats["emitted"]["info"]
+    assert 0 == stats["flushes"]
+    assert {} == stats["flush_latency"]["buckets_us"]
+
+
+def test_no_stats_when_disabled(capsys) -> None:
+    TealPrint.disable_stats()
+    TealPrint.info("Info")
+
+    assert TealPrint.get_stats() is None
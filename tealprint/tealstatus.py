@@ -0,0 +1,134 @@
+import atexit
+from threading import Condition, Thread
+from time import monotonic
+from typing import Optional
+
+from .tealconfig import TealConfig
+from .tealprintbuffer import TealPrintBuffer
+from .tealrecord import TealRecord
+from .tealrenderer import TealRenderer
+from .tealsink import TealSink, TealStreamSink, clear_line
+
+
+class TealStatus:
+    """A status line that is updated in place at the bottom of the terminal, e.g. to show progress.
+    It's redrawn at most TealConfig.status_refresh_rate times per second, and only the latest update is drawn.
+    When stdout isn't a terminal, or colors or unicode are disabled, the latest update is instead printed as a
+    normal message every TealConfig.status_fallback_interval seconds.
+    """
+
+    active: Optional["TealStatus"] = None
+
+    def __init__(self) -> None:
+        self.sink = TealStreamSink("stdout")
+        self._pending: Optional[TealRecord] = None
+        self._drawn_at = 0.0
+        self._condition = Condition()
+        self._thread: Optional[Thread] = None
+
+    @staticmethod
+    def get() -> "TealStatus":
+        """Get the status line, creating it if needed"""
+        status = TealStatus.active
+        if status is None:
+            status = TealStatus()
+            TealStatus.active = status
+        return status
+
+    def update(self, record: TealRecord) -> None:
+        """Show the record in the status line, now or when it's time to redraw it"""
+        with self._condition:
+            self._pending = record
+            if monotonic() - self._drawn_at >= self._get_interval():
+                self._draw()
+            elif self._thread is None:
+                self._thread = Thread(target=self._run, name="tealprint-status", daemon=True)
+                self._thread.start()
+            else:
+                self._condition.notify()
+
+    def clear(self) -> None:
+        """Remove the status line from the terminal, and discard updates that haven't been drawn"""
+        with self._condition:
+            self._pending = None
+            TealSink._mutex.acquire()
+            try:
+                stream = TealStreamSink.footer_stream
+                if len(TealStreamSink.footer) > 0 and stream is not None:
+                    self.sink.write_to_stream(stream, clear_line)
+                TealStreamSink.footer = ""
+                TealStreamSink.footer_stream = None
+            finally:
+                TealSink._mutex.release()
+
+    def _get_interval(self) -> float:
+        if self._is_inline():
+            return 1 / TealConfig.status_refresh_rate
+        return TealConfig.status_fallback_interval
+
+    def _is_inline(self) -> bool:
+        """If the status line can be updated in place"""
+        if not TealConfig.colors_enabled or not TealConfig.unicode_enabled:
+            return False
+        terminal = self.sink.get_terminal()
+        return terminal.interactive and terminal.colors and terminal.unicode
+
+    def _draw(self) -> None:
+        """Draw the pending update. Called while holding the condition"""
+        record = self._pending
+        self._pending = None
+        self._drawn_at = monotonic()
+        if record is None:
+            return
+
+        stream = self.sink.get_stream()
+        if not self._is_inline():
+            buffer = TealPrintBuffer()
+            buffer._add_to_buffer(record)
+            buffer.flush()
+            return
+
+        line = TealStatus._render(record)
+        TealSink._mutex.acquire()
+        try:
+            TealStreamSink.footer = line
+            TealStreamSink.footer_stream = stream
+            self.sink.write_to_stream(stream, clear_line + line)
+        finally:
+            TealSink._mutex.release()
+
+    @staticmethod
+    def _render(record: TealRecord) -> str:
+        """Render the record as one line that fits the terminal, since a wrapped line can't be updated in place"""
+        import shutil
+
+        # Only drawn in place when the terminal supports colors and unicode
+        renderer = TealRenderer.get()
+        indent = renderer.get_indent(record.indent_level)
+        message = record.get_message().replace("\n", " ")
+        width = max(shutil.get_terminal_size().columns - 1 - len(indent), 0)
+        if len(message) > width:
+            message = message[:width]
+        return renderer.render(message, record.color, indent)
+
+    def _run(self) -> None:
+        """Draws updates that had to wait for the next redraw"""
+        with self._condition:
+            while True:
+                while self._pending is None:
+                    self._condition.wait()
+                wait = self._drawn_at + self._get_interval() - monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                else:
+                    self._draw()
+
+    @staticmethod
+    def _clear_active() -> None:
+        status = TealStatus.active
+        if status is not None:
+            status.clear()
+
+
+# Don't leave the status line behind for the shell prompt
+atexit.register(TealStatus._clear_active)
@@ -0,0 +1,98 @@
+import io
+import sys
+import time
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, TealStatus
+
+
+class Terminal(io.StringIO):
+    """Captures output and pretends to be a terminal"""
+
+    encoding = "utf-8"
+
+    def isatty(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def status():
+    TealStatus.active = None
+    yield
+    TealPrint.end_status()
+    TealStatus.active = None
+    TealConfig.reset()
+
+
+def use_terminal(monkeypatch) -> Terminal:
+    # Replaced in the test itself, since pytest sets its own stdout when the test starts
+    terminal = Terminal()
+    monkeypatch.setattr(sys, "stdout", terminal)
+    return terminal
+
+
+def test_updates_line_in_place_and_skips_updates_in_between(monkeypatch) -> None:
+    terminal = use_terminal(monkeypatch)
+    TealConfig.status_refresh_rate = 5
+    for i in range(100):
+        TealPrint.status("Item %d", args=(i,))
+    time.sleep(0.5)
+
+    assert "\r\x1b[2KItem 0\r\x1b[2KItem 99" == terminal.getvalue()
+
+
+def test_messages_are_printed_above_the_status(monkeypatch) -> None:
+    terminal = use_terminal(monkeypatch)
+    TealPrint.status("Working")
+    TealPrint.info("Done")
+    TealPrint.end_status()
+
+    assert "\r\x1b[2KWorking\r\x1b[2KDone\nWorking\r\x1b[2K" == terminal.getvalue()
+
+
+def test_status_is_indented(monkeypatch) -> None:
+    terminal = use_terminal(monkeypatch)
+    TealPrint.push_indent(TealConfig.level)
+    TealPrint.status("Working")
+    TealPrint.clear_indent()
+
+    assert "\r\x1b[2K    Working" == terminal.getvalue()
+
+
+@pytest.mark.parametrize(
+    "name,colors_enabled,unicode_enabled",
+    [
+        ("Colors disabled", False, True),
+        ("Unicode disabled", True, False),
+    ],
+)
+def test_falls_back_to_lines_when_disabled(
+    name: str, colors_enabled: bool, unicode_enabled: bool, monkeypatch
+) -> None:
+    print(name)
+    terminal = use_terminal(monkeypatch)
+    TealConfig.colors_enabled = colors_enabled
+    TealConfig.unicode_enabled = unicode_enabled
+
+    TealPrint.status("First")
+    TealPrint.status("Second")
+
+    assert "First\n" == terminal.getvalue()
+
+
+def test_falls_back_to_periodic_lines_when_not_a_terminal(capsys) -> None:
+    TealConfig.status_fallback_interval = 0.05
+    TealPrint.status("1")
+    TealPrint.status("2")
+    TealPrint.status("3")
+    time.sleep(0.2)
+
+    assert "1\n3\n" == capsys.readouterr().out
+
+
+def test_hidden_level_is_not_shown(monkeypatch) -> None:
+    terminal = use_terminal(monkeypatch)
+    TealPrint.status("Debugging", level=TealLevel.debug)
+
+    assert "" == terminal.getvalue()
@@ -0,0 +1,62 @@
+from typing import Any, List, Optional, Sequence
+
+
+class TealTable:
+    """Formats rows as aligned columns. Numbers are aligned to the right, everything else to the left.
+    Column widths grow with the rows that are formatted, so rows can be formatted in chunks without having all of
+    them in memory. Rows formatted before a column grew aren't realigned.
+    """
+
+    def __init__(self, header: Optional[Sequence[Any]] = None, separator: str = "  ") -> None:
+        """
+        Args:
+            header (Optional[Sequence[Any]]): Titles of the columns, printed above the first rows and underlined
+            separator (str): Between columns
+        """
+        self.header = header
+        self.separator = separator
+        self.widths: List[int] = []
+        self._header_done = header is None
+        if header is not None:
+            self._update_widths([str(title) for title in header])
+
+    def format(self, rows: Sequence[Sequence[Any]]) -> List[str]:
+        """Format the rows as lines. The first call also returns the header
+
+        Args:
+            rows (Sequence[Sequence[Any]]): Rows of cells, any cell is converted with str()
+        """
+        cells = [[str(cell) for cell in row] for row in rows]
+        for row in cells:
+            self._update_widths(row)
+
+        lines: List[str] = []
+        if not self._header_done and self.header is not None:
+            self._header_done = True
+            lines.append(self._format_row([str(title) for title in self.header], []))
+            lines.append(self.separator.join("-" * width for width in self.widths))
+
+        for row, original in zip(cells, rows):
+            lines.append(self._format_row(row, original))
+        return lines
+
+    def _update_widths(self, row: List[str]) -> None:
+        widths = self.widths
+        for i, cell in enumerate(row):
+            if i >= len(widths):
+                widths.append(len(cell))
+            elif len(cell) > widths[i]:
+                widths[i] = len(cell)
+
+    def _format_row(self, row: List[str], original: Sequence[Any]) -> str:
+        parts = []
+        last = len(row) - 1
+        for i, cell in enumerate(row):
+            if i < len(original) and isinstance(original[i], (int, float)) and not isinstance(original[i], bool):
+                parts.append(cell.rjust(self.widths[i]))
+            elif i == last:
+                # No trailing spaces
+                parts.append(cell)
+            else:
+                parts.append(cell.ljust(self.widths[i]))
+        return self.separator.join(parts)
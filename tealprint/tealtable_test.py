@@ -0,0 +1,99 @@
+from typing import Any, List, Optional, Sequence
+
+import pytest
+
+from . import TealConfig, TealLevel, TealPrint, TealPrintBuffer
+from .tealtable import TealTable
+
+
+@pytest.mark.parametrize(
+    "name,header,rows,expected",
+    [
+        (
+            "Aligns columns",
+            None,
+            [["a", "bbb"], ["cc", "d"]],
+            ["a   bbb", "cc  d"],
+        ),
+        (
+            "Underlines header",
+            ["Name", "Size"],
+            [["file.txt", 12], ["a", 1234]],
+            ["Name      Size", "--------  ----", "file.txt    12", "a         1234"],
+        ),
+        (
+            "Only header",
+            ["Name"],
+            [],
+            ["Name", "----"],
+        ),
+        (
+            "Rows of different lengths",
+            None,
+            [["a"], ["bb", "c"]],
+            ["a", "bb  c"],
+        ),
+    ],
+)
+def test_format(name: str, header: Optional[Sequence[Any]], rows: List[List[Any]], expected: List[str]) -> None:
+    print(name)
+    assert expected == TealTable(header).format(rows)
+
+
+def test_columns_grow_with_later_rows() -> None:
+    table = TealTable()
+
+    assert ["a  b"] == table.format([["a", "b"]])
+    assert ["ccc  d", "a    b"] == table.format([["ccc", "d"], ["a", "b"]])
+
+
+def test_lines_are_indented_and_written_in_chunks(capsys, monkeypatch) -> None:
+    TealConfig.colors_enabled = False
+    written: List[int] = []
+    original = TealPrintBuffer._write
+
+    def write(records) -> None:
+        written.append(len(records))
+        original(records)
+
+    monkeypatch.setattr(TealPrintBuffer, "_write", staticmethod(write))
+    TealPrint.push_indent(TealLevel.info)
+    TealPrint.lines((str(i) for i in range(5)), chunk_size=2)
+    TealPrint.pop_indent()
+
+    assert [2, 2, 1] == written
+    assert "".join(f"    {i}\n" for i in range(5)) == capsys.readouterr().out
+    TealConfig.reset()
+
+
+def test_lines_end_repeated_messages() -> None:
+    TealConfig.collapse_repeated = True
+    buffer = TealPrintBuffer()
+
+    buffer.info("a")
+    buffer.info("a")
+    buffer.lines(["x", "y"])
+    buffer.info("a")
+    buffer.info("b")
+
+    assert "a\n(repeated 1 more time)\nx\ny\na\nb\n" == buffer.getvalue()
+    TealConfig.reset()
+
+
+def test_hidden_lines_are_not_iterated(capsys) -> None:
+    def messages():
+        raise AssertionError("Shouldn't be iterated")
+        yield "Hidden"
+
+    TealPrint.lines(messages(), level=TealLevel.debug)
+    TealPrint.table(messages(), level=TealLevel.debug)
+
+    assert "" == capsys.readouterr().out
+
+
+def test_table(capsys) -> None:
+    TealConfig.colors_enabled = False
+    TealPrint.table([["a", 1], ["bb", 22]], header=["Name", "Count"], chunk_size=1)
+
+    assert "Name  Count\n----  -----\na         1\nbb       22\n" == capsys.readouterr().out
+    TealConfig.reset()
@@ -0,0 +1,56 @@
+import codecs
+import os
+from typing import Any
+
+
+class TealTerminal:
+    """What an output supports, probed once per stream by the sinks.
+    Colors are only used in interactive terminals, and can be changed with the NO_COLOR, FORCE_COLOR and TERM
+    environment variables. Unicode is only used when the output is encoded as UTF-8/16/32.
+    """
+
+    __slots__ = ("colors", "unicode", "interactive")
+
+    def __init__(self, colors: bool, unicode: bool, interactive: bool) -> None:
+        """
+        Args:
+            colors (bool): If colors and styles can be written
+            unicode (bool): If all unicode characters can be encoded
+            interactive (bool): If the output is a terminal, e.g. so that a line can be updated in place
+        """
+        self.colors = colors
+        self.unicode = unicode
+        self.interactive = interactive
+
+    @staticmethod
+    def probe(stream: Any) -> "TealTerminal":
+        """Find out what the stream supports"""
+        try:
+            interactive = bool(stream.isatty())
+        except (AttributeError, ValueError, OSError):
+            # Not a real stream, or it has been closed
+            interactive = False
+        encoding = getattr(stream, "encoding", None) or "utf-8"
+        colors = interactive and os.environ.get("TERM") != "dumb"
+        return TealTerminal(TealTerminal._allow_colors(colors), TealTerminal._is_unicode(encoding), interactive)
+
+    @staticmethod
+    def file() -> "TealTerminal":
+        """A file that is encoded as UTF-8. Doesn't have colors unless FORCE_COLOR is set"""
+        return TealTerminal(TealTerminal._allow_colors(False), True, False)
+
+    @staticmethod
+    def _allow_colors(colors: bool) -> bool:
+        """Apply NO_COLOR and FORCE_COLOR, see https://no-color.org and https://force-color.org"""
+        if os.environ.get("NO_COLOR", ""):
+            return False
+        if os.environ.get("FORCE_COLOR", "") not in ("", "0"):
+            return True
+        return colors
+
+    @staticmethod
+    def _is_unicode(encoding: str) -> bool:
+        try:
+            return codecs.lookup(encoding).name.startswith("utf")
+        except LookupError:
+            return False
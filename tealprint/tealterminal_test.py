@@ -0,0 +1,73 @@
+import io
+from typing import Dict
+
+import pytest
+
+from . import TealConfig, TealPrint, TealStreamSink, TealTerminal
+
+red = "\x1b[38;5;1m"
+reset = "\x1b[0m"
+
+
+class Stream(io.StringIO):
+    def __init__(self, tty: bool, encoding: str) -> None:
+        super().__init__()
+        self.tty = tty
+        self._encoding = encoding
+
+    @property
+    def encoding(self) -> str:  # type: ignore
+        return self._encoding
+
+    def isatty(self) -> bool:
+        return self.tty
+
+
+@pytest.mark.parametrize(
+    "name,tty,encoding,env,colors,unicode",
+    [
+        ("Terminal", True, "utf-8", {}, True, True),
+        ("Pipe", False, "utf-8", {}, False, True),
+        ("ASCII terminal", True, "ascii", {}, True, False),
+        ("Latin-1 terminal", True, "latin-1", {}, True, False),
+        ("UTF-16 terminal", True, "UTF16", {}, True, True),
+        ("Unknown encoding", True, "no-such-encoding", {}, True, False),
+        ("Dumb terminal", True, "utf-8", {"TERM": "dumb"}, False, True),
+        ("NO_COLOR", True, "utf-8", {"NO_COLOR": "1"}, False, True),
+        ("Empty NO_COLOR", True, "utf-8", {"NO_COLOR": ""}, True, True),
+        ("FORCE_COLOR to a pipe", False, "utf-8", {"FORCE_COLOR": "1"}, True, True),
+        ("FORCE_COLOR=0", False, "utf-8", {"FORCE_COLOR": "0"}, False, True),
+        ("NO_COLOR wins over FORCE_COLOR", True, "utf-8", {"NO_COLOR": "1", "FORCE_COLOR": "1"}, False, True),
+    ],
+)
+def test_probe(
+    name: str, tty: bool, encoding: str, env: Dict[str, str], colors: bool, unicode: bool, monkeypatch
+) -> None:
+    print(name)
+    for variable in ["TERM", "NO_COLOR", "FORCE_COLOR"]:
+        monkeypatch.delenv(variable, raising=False)
+    for variable, value in env.items():
+        monkeypatch.setenv(variable, value)
+
+    terminal = TealTerminal.probe(Stream(tty, encoding))
+
+    assert colors == terminal.colors
+    assert unicode == terminal.unicode
+    assert tty == terminal.interactive
+
+
+def test_stream_sink_probes_again_when_stream_changes(monkeypatch) -> None:
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.delenv("TERM", raising=False)
+    terminal = Stream(True, "utf-8")
+    pipe = Stream(False, "ascii")
+    TealConfig.sinks = [TealStreamSink(terminal)]
+
+    TealPrint.error("🔥 Failed", color=red)
+    TealConfig.sinks[0].stream = pipe  # type: ignore
+    TealPrint.error("🔥 Failed", color=red)
+
+    assert f"{red}🔥 Failed{reset}\n" == terminal.getvalue()
+    assert " Failed\n" == pipe.getvalue()
+
+    TealConfig.reset()
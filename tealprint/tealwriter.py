@@ -0,0 +1,139 @@
+import atexit
+import os
+import sys
+from collections import deque
+from threading import Condition, Thread, current_thread
+from typing import Any, Callable, Deque, List, Optional
+
+from .tealbackpressure import TealBackpressure
+
+
+class TealWriter:
+    """Writes messages on a dedicated background thread.
+    Flushed messages are queued by the caller and drained in batches, so each batch only costs one write.
+    """
+
+    active: Optional["TealWriter"] = None
+
+    def __init__(
+        self,
+        write: Callable[[List[Any]], None],
+        max_queue_size: int = 10000,
+        backpressure: TealBackpressure = TealBackpressure.block,
+    ) -> None:
+        """
+        Args:
+            write (Callable[[List[Any]], None]): Called on the writer thread with all queued items of a batch
+            max_queue_size (int): Maximum number of queued items waiting to be written
+            backpressure (TealBackpressure): What to do when the queue is full
+        """
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+
+        self.max_queue_size = max_queue_size
+        self.backpressure = backpressure
+        self.dropped = 0
+        self._write = write
+        self._queue: Deque[Any] = deque()
+        self._condition = Condition()
+        self._writing = False
+        self._stopped = False
+        self._thread = Thread(target=self._run, name="tealprint-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, item: Any) -> None:
+        """Queue an item for writing, applying the backpressure policy if the queue is full"""
+        with self._condition:
+            if self._stopped or current_thread() is self._thread:
+                # Writer is gone (or we're called from it), write directly so nothing is lost
+                self._write([item])
+                return
+
+            while len(self._queue) >= self.max_queue_size:
+                if self.backpressure == TealBackpressure.drop_newest:
+                    self.dropped += 1
+                    return
+                elif self.backpressure == TealBackpressure.drop_oldest:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    self._condition.wait()
+
+            self._queue.append(item)
+            self._condition.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued messages have been written
+
+        Returns:
+            bool: False if the timeout expired before the queue was drained
+        """
+        if current_thread() is self._thread:
+            return False
+
+        with self._condition:
+            return self._condition.wait_for(lambda: self._stopped or not (self._queue or self._writing), timeout)
+
+    def stop(self) -> None:
+        """Write all queued messages and stop the writer thread"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread.is_alive() and current_thread() is not self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if not self._queue:
+                    self._condition.notify_all()
+                    return
+
+                batch = list(self._queue)
+                self._queue.clear()
+                self._writing = True
+                # Wake up producers waiting for room in the queue
+                self._condition.notify_all()
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                # A failing write must never take the writer thread down with it, but it mustn't go unnoticed either
+                self.dropped += len(batch)
+                self._report(e, len(batch))
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    @staticmethod
+    def _report(error: Exception, count: int) -> None:
+        """Tell that a batch couldn't be written, on the original stderr since the sinks might be what fails"""
+        stderr = sys.__stderr__
+        if stderr is None:
+            return
+        try:
+            stderr.write(f"tealprint: dropped {count} queued write(s), writing them failed: {error!r}\n")
+            stderr.flush()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _stop_active() -> None:
+        """Stops the active writer, flushing all queued messages. Called when the interpreter shuts down"""
+        writer = TealWriter.active
+        TealWriter.active = None
+        if writer:
+            writer.stop()
+
+
+atexit.register(TealWriter._stop_active)
+
+
+if hasattr(os, "register_at_fork"):
+    # The writer thread doesn't exist in a forked child, write on the calling thread there instead
+    os.register_at_fork(after_in_child=lambda: setattr(TealWriter, "active", None))
@@ -0,0 +1,133 @@
+import os
+import subprocess
+import sys
+from threading import Event
+from typing import List
+
+import pytest
+
+from . import TealBackpressure, TealPrint
+from .tealwriter import TealWriter
+
+
+class BlockingWrite:
+    """Write function that blocks the writer thread until released"""
+
+    def __init__(self) -> None:
+        self.written: List[str] = []
+        self.started = Event()
+        self.release = Event()
+
+    def __call__(self, batch: List[str]) -> None:
+        self.started.set()
+        self.release.wait()
+        self.written.append("".join(batch))
+
+
+def test_writes_queued_messages_in_one_batch() -> None:
+    write = BlockingWrite()
+    writer = TealWriter(write)
+    writer.start()
+
+    # First message occupies the writer thread, the rest are queued behind it
+    writer.put("first\n")
+    write.started.wait()
+    writer.put("second\n")
+    writer.put("third\n")
+    write.release.set()
+    writer.stop()
+
+    assert ["first\n", "second\nthird\n"] == write.written
+
+
+@pytest.mark.parametrize(
+    "name,backpressure,expected",
+    [
+        ("Drops the oldest message when full", TealBackpressure.drop_oldest, ["1\n", "3\n4\n"]),
+        ("Drops the newest message when full", TealBackpressure.drop_newest, ["1\n", "2\n3\n"]),
+    ],
+)
+def test_backpressure(name: str, backpressure: TealBackpressure, expected: List[str]) -> None:
+    print(name)
+
+    write = BlockingWrite()
+    writer = TealWriter(write, max_queue_size=2, backpressure=backpressure)
+    writer.start()
+
+    writer.put("1\n")
+    write.started.wait()
+    writer.put("2\n")
+    writer.put("3\n")
+    writer.put("4\n")
+    write.release.set()
+    writer.stop()
+
+    assert expected == write.written
+    assert 1 == writer.dropped
+
+
+def test_writes_directly_after_stop() -> None:
+    written: List[List[str]] = []
+    writer = TealWriter(written.append)
+    writer.start()
+    writer.stop()
+
+    writer.put("message\n")
+
+    assert [["message\n"]] == written
+
+
+def test_async_prints_everything_after_drain(capsys) -> None:
+    TealPrint.enable_async()
+    for i in range(100):
+        TealPrint.info(f"{i}")
+    TealPrint.drain()
+    TealPrint.disable_async()
+
+    assert "".join(f"{i}\n" for i in range(100)) == capsys.readouterr().out
+    assert TealWriter.active is None
+
+
+def test_async_drains_before_exit(capsys) -> None:
+    TealPrint.enable_async()
+
+    with pytest.raises(SystemExit):
+        TealPrint.error("Fatal", exit=True)
+
+    assert "Fatal" in capsys.readouterr().out
+    TealPrint.disable_async()
+
+
+def test_async_drains_on_interpreter_shutdown() -> None:
+    code = "\n".join(
+        [
+            "from tealprint import TealPrint",
+            "TealPrint.enable_async()",
+            "for i in range(1000):",
+            "    TealPrint.info(str(i))",
+        ]
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+    assert "".join(f"{i}\n" for i in range(1000)) == result.stdout
+
+
+def test_reports_and_counts_failed_writes(monkeypatch, capsys) -> None:
+    def write(batch: List[str]) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(sys, "__stderr__", sys.stderr)
+    writer = TealWriter(write)
+    writer.start()
+    writer.put("message\n")
+    writer.stop()
+
+    assert 1 == writer.dropped
+    assert "writing them failed: OSError('disk full')" in capsys.readouterr().err